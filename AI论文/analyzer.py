@@ -1,24 +1,254 @@
 import logging
-from typing import Dict, List
-import jieba
-import jieba.analyse
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 from collections import Counter
 import re
-from textblob import TextBlob
-from gensim import corpora, models
-import numpy as np
+
+from config import Config
+from idf_index import IDFIndex, get_idf_index
+from keyphrase import RakeExtractor
+from segmenter import iter_spans
+
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# 分离中英文时需要识别的片段类型，URL 单独识别以便整体丢弃
+_SPLIT_KINDS = ('url', 'cjk', 'latin')
+_SENTENCE_END_RE = re.compile(r'[.!?;\n\u3002\uff01\uff1f\uff1b]')
+
+# 英文关键短语后端：textblob 基于词性标注和名词短语，rake 基于停用词切分和共现打分
+KEYPHRASE_BACKENDS = ('textblob', 'rake')
+
+# jieba 词典和英文词性标注模型加载较慢，按需加载并在进程内共享
+_nlp_lock = threading.Lock()
+_jieba = None
+_blobber = None
+_rake = RakeExtractor()
+
+
+def _get_jieba():
+    """返回已加载词典的 jieba 模块，进程内只初始化一次"""
+    global _jieba
+    if _jieba is None:
+        with _nlp_lock:
+            if _jieba is None:
+                import jieba
+                import jieba.analyse
+                jieba.initialize()
+                _jieba = jieba
+    return _jieba
+
+
+def _create_blobber():
+    from nltk.tag.perceptron import PerceptronTagger
+    from textblob import Blobber, TextBlob
+    from textblob.base import BaseTagger
+    from textblob.en.np_extractors import FastNPExtractor
+
+    class SharedPerceptronTagger(BaseTagger):
+        """复用同一个感知机模型的词性标注器，避免每次标注都重新加载模型"""
+
+        def __init__(self):
+            self._tagger = None
+
+        def tag(self, text):
+            if self._tagger is None:
+                self._tagger = PerceptronTagger()
+            if isinstance(text, str):
+                text = TextBlob(text)
+            return self._tagger.tag(text.tokens)
+
+    return Blobber(pos_tagger=SharedPerceptronTagger(), np_extractor=FastNPExtractor())
+
+
+def _get_blobber():
+    """返回共享词性标注器和名词短语提取器的 TextBlob 工厂，进程内只创建一次"""
+    global _blobber
+    if _blobber is None:
+        with _nlp_lock:
+            if _blobber is None:
+                _blobber = _create_blobber()
+    return _blobber
+
+
+def prewarm(english: bool = True):
+    """
+    预先加载 jieba 词典和英文模型，供工作进程初始化时调用
+    
+    Args:
+        english: 是否同时加载英文词性标注和名词短语模型
+    """
+    _get_jieba()
+    if not english:
+        return
+    try:
+        # 标注一个短句即可触发模型加载和名词短语提取器的训练
+        blob = _get_blobber()("Topic analysis warm up.")
+        blob.tags
+        blob.noun_phrases
+    except Exception as e:
+        logger.error(f"预加载英文模型时出错: {str(e)}")
+
+
+class _AnalysisContext:
+    """一次分析中各阶段共享的分词和标注结果，每种语言只处理一次"""
+    
+    # 关键词数量，主题取权重最高的关键词
+    KEYWORD_COUNT = 10
+    
+    def __init__(self, chinese_text: str, english_text: str, idf_index: Optional[IDFIndex] = None,
+                 prior_documents: int = 0):
+        self.chinese_text = chinese_text
+        self.english_text = english_text
+        self.idf_index = idf_index
+        self.prior_documents = prior_documents
+        self._chinese_words = None
+        self._chinese_tags = None
+        self._english_blob = None
+        self._english_candidates = None
+        
+    @property
+    def chinese_words(self) -> List[str]:
+        """中文分词结果"""
+        if self._chinese_words is None:
+            self._chinese_words = _get_jieba().lcut(self.chinese_text) if self.chinese_text else []
+        return self._chinese_words
+        
+    @property
+    def chinese_tags(self) -> List[Tuple[str, float]]:
+        """按TF-IDF权重降序排列的中文关键词及权重，有语料IDF索引时使用与 jieba 混合的IDF"""
+        if self._chinese_tags is None:
+            if not self.chinese_text:
+                self._chinese_tags = []
+            elif self.idf_index is None:
+                self._chinese_tags = _get_jieba().analyse.extract_tags(
+                    self.chinese_text,
+                    topK=self.KEYWORD_COUNT,
+                    withWeight=True
+                )
+            else:
+                self._chinese_tags = self._rank_by_idf(Counter(self.index_terms()[0]))
+        return self._chinese_tags
+        
+    def index_terms(self) -> Tuple[List[str], List[str]]:
+        """
+        与IDF索引一致的词：中文为去除停用词和单字后的分词，英文为小写单词
+        
+        Returns:
+            Tuple[List[str], List[str]]: (中文词, 英文词)
+        """
+        stop_words = _get_jieba().analyse.default_tfidf.stop_words
+        chinese = [
+            word for word in self.chinese_words
+            if len(word.strip()) >= 2 and word.lower() not in stop_words
+        ]
+        english = re.findall(r'[a-z]+', self.english_text.lower())
+        return chinese, english
+        
+    def blended_idf(self, terms: List[str]) -> 'np.ndarray':
+        """
+        语料IDF与 jieba 自带IDF的加权平均
+        
+        语料IDF的权重为 N/(N+prior_documents)，语料越大越以其为准；语料中未出现的词
+        只说明语料尚小，使用 jieba 的IDF（jieba 也未收录时取其中位数，与 extract_tags 一致）。
+        
+        Args:
+            terms: 小写的词列表
+            
+        Returns:
+            np.ndarray: 每个词的IDF
+        """
+        import numpy as np
+
+        tfidf = _get_jieba().analyse.default_tfidf
+        prior = np.fromiter(
+            (tfidf.idf_freq.get(term, tfidf.median_idf) for term in terms), dtype=float, count=len(terms)
+        )
+        documents = self.idf_index.document_count
+        weight = documents / (documents + self.prior_documents) if documents else 0.0
+        df = self.idf_index.document_frequency(terms)
+        corpus = np.log((documents + 1) / (df + 1)) + 1
+        return np.where(df > 0, weight * corpus + (1 - weight) * prior, prior)
+        
+    def _rank_by_idf(self, counts: Counter) -> List[Tuple[str, float]]:
+        """按词频乘以混合IDF排序，返回权重最高的关键词及权重"""
+        if not counts:
+            return []
+        import numpy as np
+
+        terms = list(counts)
+        tf = np.fromiter(counts.values(), dtype=float, count=len(terms)) / sum(counts.values())
+        weights = tf * self.blended_idf([term.lower() for term in terms])
+        # 稳定排序，权重相同时保持词的出现顺序
+        order = np.argsort(-weights, kind='stable')[:self.KEYWORD_COUNT]
+        return [(terms[i], float(weights[i])) for i in order]
+        
+    def english_keywords(self, words: List[str]) -> List[str]:
+        """
+        对候选英文词排序，有语料IDF索引时按词频乘以混合IDF，否则按词频
+        
+        Args:
+            words: 候选词，可重复
+            
+        Returns:
+            List[str]: 权重最高的关键词
+        """
+        counts = Counter(words)
+        if self.idf_index is None:
+            return [word for word, _ in counts.most_common(self.KEYWORD_COUNT)]
+        return [word for word, _ in self._rank_by_idf(counts)]
+        
+    @property
+    def english_blob(self):
+        """英文文本的TextBlob，词性标注和名词短语在其上缓存"""
+        if self._english_blob is None:
+            self._english_blob = _get_blobber()(self.english_text)
+        return self._english_blob
+        
+    @property
+    def english_candidates(self) -> List[Tuple[str, ...]]:
+        """RAKE 切分出的英文候选短语"""
+        if self._english_candidates is None:
+            self._english_candidates = _rake.candidates(self.english_text)
+        return self._english_candidates
+        
+
 class TopicAnalyzer:
     """主题分析器，负责分析文章主题和提取关键词"""
     
-    def __init__(self):
+    def __init__(self, idf_index_path: Optional[str] = None, keyphrase_backend: Optional[str] = None):
+        """
+        初始化主题分析器
+        
+        Args:
+            idf_index_path: 语料IDF索引目录，默认使用配置中的 IDF_INDEX_PATH，为空字符串表示不使用
+            keyphrase_backend: 英文关键短语后端，'textblob' 或 'rake'，默认使用配置中的 KEYPHRASE_BACKEND
+        """
+        config = Config()
         # 加载停用词
         self.stopwords = self._load_stopwords()
+        self.idf_index_path = config.IDF_INDEX_PATH if idf_index_path is None else idf_index_path
+        self.idf_min_documents = config.IDF_MIN_DOCUMENTS
+        self.idf_prior_documents = config.IDF_PRIOR_DOCUMENTS
+        self.keyphrase_backend = keyphrase_backend or config.KEYPHRASE_BACKEND
+        self.max_workers = config.MAX_WORKERS
+        if self.keyphrase_backend not in KEYPHRASE_BACKENDS:
+            raise ValueError(f"未知的英文关键短语后端: {self.keyphrase_backend}")
         
-        # 初始化jieba分析器
-        jieba.initialize()
+    @property
+    def idf_index(self) -> Optional[IDFIndex]:
+        """
+        语料IDF索引，索引尚未建立或文档数不足 IDF_MIN_DOCUMENTS 时为 None，
+        此时使用 jieba 自带的IDF和英文词频
+        """
+        index = get_idf_index(self.idf_index_path)
+        if index is None or index.document_count < self.idf_min_documents:
+            return None
+        return index
         
     def analyze(self, text: str) -> Dict:
         """
@@ -31,19 +261,20 @@ class TopicAnalyzer:
             Dict: 包含主题、关键词等信息的字典
         """
         try:
-            # 预处理文本
-            cleaned_text = self._preprocess_text(text)
-            
-            # 分离中英文
-            chinese_text, english_text = self._split_languages(cleaned_text)
+            # 分离中英文，各阶段共享同一份分词和标注结果
+            context = _AnalysisContext(
+                *self._split_languages(text),
+                idf_index=self.idf_index,
+                prior_documents=self.idf_prior_documents
+            )
             
             # 分析主题
-            chinese_topic = self._analyze_chinese_topic(chinese_text)
-            english_topic = self._analyze_english_topic(english_text)
+            chinese_topic = self._analyze_chinese_topic(context)
+            english_topic = self._analyze_english_topic(context)
             
             # 提取关键词
-            chinese_keywords = self._extract_chinese_keywords(chinese_text)
-            english_keywords = self._extract_english_keywords(english_text)
+            chinese_keywords = self._extract_chinese_keywords(context)
+            english_keywords = self._extract_english_keywords(context)
             
             # 合并结果
             result = {
@@ -66,6 +297,78 @@ class TopicAnalyzer:
                 'keywords': {'en': [], 'cn': []}
             }
             
+    def analyze_many(self, texts: Iterable[str], max_workers: Optional[int] = None,
+                     chunk_chars: int = 20000) -> Iterator[Tuple[int, Dict]]:
+        """
+        批量分析文本，按完成顺序逐个产出结果
+        
+        短文本按累计长度合并为一个任务以减少进程间通信，超长文本单独成为一个任务；
+        同时在途的任务数有上限，输入可以是生成器，一篇超长文档也不会阻塞其它文本的结果。
+        工作进程启动时创建与当前实例配置相同的分析器，并预加载 jieba 词典和所需的英文模型。
+        
+        Args:
+            texts: 待分析的文本序列
+            max_workers: 工作进程数，默认使用 Config.MAX_WORKERS（不超过CPU核数），1 表示在当前进程中逐篇分析
+            chunk_chars: 合并短文本时每个任务的字符数上限
+            
+        Yields:
+            Tuple[int, Dict]: (文本在输入中的序号, analyze 的结果)
+        """
+        if max_workers is None:
+            # 与PDF并行提取一致，CPU密集的进程池不超过CPU核数
+            max_workers = min(self.max_workers, os.cpu_count() or 1)
+        if max_workers <= 1:
+            for index, text in enumerate(texts):
+                yield index, self.analyze(text)
+            return
+            
+        chunks = _iter_chunks(texts, chunk_chars)
+        max_pending = max_workers * 2
+        exhausted = False
+        pending = set()
+        
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(self.idf_index_path, self.keyphrase_backend)) as executor:
+            while True:
+                # 保持有限数量的任务在途，边读取输入边提交
+                while not exhausted and len(pending) < max_pending:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                    else:
+                        pending.add(executor.submit(_analyze_chunk, chunk))
+                if not pending:
+                    break
+                    
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield from future.result()
+                    
+    def add_to_index(self, texts: Iterable[str]) -> int:
+        """
+        将文本加入语料IDF索引，索引不存在时新建
+        
+        Args:
+            texts: 文本序列
+            
+        Returns:
+            int: 加入的文档数
+        """
+        if not self.idf_index_path:
+            return 0
+        
+        def documents():
+            for text in texts:
+                context = _AnalysisContext(*self._split_languages(text))
+                chinese, english = context.index_terms()
+                yield chinese + english
+                
+        try:
+            return get_idf_index(self.idf_index_path, create=True).add_documents(documents())
+        except Exception as e:
+            logger.error(f"更新IDF索引时出错: {str(e)}")
+            return 0
+        
     def _load_stopwords(self) -> set:
         """加载停用词"""
         try:
@@ -79,54 +382,58 @@ class TopicAnalyzer:
             logger.error(f"加载停用词时出错: {str(e)}")
             return set()
             
-    def _preprocess_text(self, text: str) -> str:
-        """预处理文本"""
-        # 移除URL
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        
-        # 移除特殊字符
-        text = re.sub(r'[^\w\s\u4e00-\u9fff]', ' ', text)
-        
-        # 统一空白字符
-        text = re.sub(r'\s+', ' ', text)
+    def _split_languages(self, text: str) -> tuple:
+        """
+        一次扫描分离中英文，URL 整体丢弃
         
-        return text.strip()
+        英文单词以空格连接，原文在两词之间（URL 之外）有句末标点时以句号连接，
+        避免词性标注和名词短语跨句。
         
-    def _split_languages(self, text: str) -> tuple:
-        """分离中英文"""
-        chinese = ''.join(re.findall(r'[\u4e00-\u9fff]+', text))
-        english = ''.join(re.findall(r'[a-zA-Z]+', text))
-        return chinese, english
+        Args:
+            text: 原始文本
+            
+        Returns:
+            tuple: (中文文本, 英文文本)
+        """
+        chinese = []
+        english = []
+        previous_end = 0
+        sentence_end = False
+        for kind, start, end, span_text in iter_spans(text, _SPLIT_KINDS):
+            # 片段之间是未识别的字符：空白、标点和数字
+            if not sentence_end and start > previous_end:
+                sentence_end = _SENTENCE_END_RE.search(text, previous_end, start) is not None
+            previous_end = end
+            if kind == 'cjk':
+                chinese.append(span_text)
+            elif kind == 'latin':
+                if english:
+                    english.append('. ' if sentence_end else ' ')
+                english.append(span_text)
+                sentence_end = False
+        return ''.join(chinese), ''.join(english)
         
-    def _analyze_chinese_topic(self, text: str) -> str:
+    def _analyze_chinese_topic(self, context: _AnalysisContext) -> str:
         """分析中文主题"""
         try:
-            # 使用jieba进行分词
-            words = jieba.cut(text)
-            words = [w for w in words if w not in self.stopwords]
-            
-            # 使用TF-IDF提取主题词
-            tfidf = jieba.analyse.extract_tags(
-                text,
-                topK=5,
-                withWeight=True
-            )
-            
-            # 返回权重最高的词作为主题
+            # 返回TF-IDF权重最高的词作为主题
+            tfidf = context.chinese_tags
             return tfidf[0][0] if tfidf else ''
             
         except Exception as e:
             logger.error(f"分析中文主题时出错: {str(e)}")
             return ''
             
-    def _analyze_english_topic(self, text: str) -> str:
+    def _analyze_english_topic(self, context: _AnalysisContext) -> str:
         """分析英文主题"""
         try:
-            # 使用TextBlob进行词性标注
-            blob = TextBlob(text)
-            
+            if self.keyphrase_backend == 'rake':
+                # 返回共现得分最高的候选短语作为主题
+                ranked = _rake.rank(context.english_candidates, top_k=1)
+                return ranked[0][0] if ranked else ''
+                
             # 提取名词短语
-            noun_phrases = blob.noun_phrases
+            noun_phrases = context.english_blob.noun_phrases
             
             # 统计词频
             phrase_counts = Counter(noun_phrases)
@@ -139,36 +446,58 @@ class TopicAnalyzer:
             logger.error(f"分析英文主题时出错: {str(e)}")
             return ''
             
-    def _extract_chinese_keywords(self, text: str) -> List[str]:
+    def _extract_chinese_keywords(self, context: _AnalysisContext) -> List[str]:
         """提取中文关键词"""
         try:
-            # 使用jieba提取关键词
-            keywords = jieba.analyse.extract_tags(
-                text,
-                topK=10,
-                withWeight=False
-            )
-            return keywords
+            # 复用主题分析时提取的关键词
+            return [word for word, _ in context.chinese_tags]
             
         except Exception as e:
             logger.error(f"提取中文关键词时出错: {str(e)}")
             return []
             
-    def _extract_english_keywords(self, text: str) -> List[str]:
+    def _extract_english_keywords(self, context: _AnalysisContext) -> List[str]:
         """提取英文关键词"""
         try:
-            # 使用TextBlob进行词性标注
-            blob = TextBlob(text)
-            
-            # 提取名词和形容词
-            words = [word for (word, tag) in blob.tags if tag.startswith(('NN', 'JJ'))]
-            
-            # 统计词频
-            word_counts = Counter(words)
+            if self.keyphrase_backend == 'rake':
+                # 候选短语中的词，即去除停用词后的实词
+                words = [word for phrase in context.english_candidates for word in phrase]
+            else:
+                # 提取名词和形容词
+                words = [word for (word, tag) in context.english_blob.tags if tag.startswith(('NN', 'JJ'))]
             
-            # 返回最常见的10个词
-            return [word for word, _ in word_counts.most_common(10)]
+            # 按词频（有语料IDF索引时乘以IDF）返回权重最高的10个词
+            return context.english_keywords(words)
             
         except Exception as e:
             logger.error(f"提取英文关键词时出错: {str(e)}")
-            return [] 
\ No newline at end of file
+            return [] 
+
+
+def _iter_chunks(texts: Iterable[str], chunk_chars: int) -> Iterator[List[Tuple[int, str]]]:
+    """将文本按累计长度分组，每组为 (序号, 文本) 列表"""
+    chunk = []
+    size = 0
+    for index, text in enumerate(texts):
+        if chunk and size + len(text) > chunk_chars:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append((index, text))
+        size += len(text)
+    if chunk:
+        yield chunk
+
+
+_worker_analyzer: Optional[TopicAnalyzer] = None
+
+
+def _init_worker(idf_index_path: str, keyphrase_backend: str):
+    """工作进程初始化：创建分析器并预加载所需模型"""
+    global _worker_analyzer
+    _worker_analyzer = TopicAnalyzer(idf_index_path=idf_index_path, keyphrase_backend=keyphrase_backend)
+    prewarm(english=keyphrase_backend == 'textblob')
+
+
+def _analyze_chunk(chunk: List[Tuple[int, str]]) -> List[Tuple[int, Dict]]:
+    """在工作进程中分析一组文本"""
+    return [(index, _worker_analyzer.analyze(text)) for index, text in chunk]
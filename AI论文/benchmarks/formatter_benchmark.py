@@ -0,0 +1,217 @@
+"""
+论文格式化基准测试 - 比较 formatter 与逐条 re.sub 的原始实现的耗时和输出
+
+用法（在 AI论文 目录下运行）：
+    python -m benchmarks.formatter_benchmark [--chars 400000] [--fuzz 10000]
+
+原始实现按规则表逐条替换：AI生成特征、过渡词、多余标记依次处理。比较输出时，
+原始实现使用与 formatter 相同的 Config 规则表，因此差异只来自匹配方式本身。
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, List, Optional
+
+from config import Config
+from formatter import (CN_SECTIONS, EN_SECTIONS, _CN_AI_PATTERNS, _EN_AI_PATTERNS, format_chinese_paper,
+                       format_english_paper, get_format_rules)
+
+
+def baseline_format_english(text: str, ai_patterns: List[str], transitions: List[str]) -> str:
+    """原始实现：每条规则一次 re.sub"""
+    for pattern in ai_patterns:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    for word in transitions:
+        text = re.sub(word, '', text)
+    text = re.sub(r'\*\*|\#\#|__', '', text)
+
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'([.!?])\s+([A-Z])', r'\1\n\n\2', text)
+    for section in EN_SECTIONS:
+        text = re.sub(f'({section}:?)', r'\n\n\1\n', text)
+    text = re.sub(r'\((\d{4})\)', r' [\1]', text)
+    text = re.sub(r'et\s+al\.', 'et al.', text)
+
+    formatted_lines = []
+    for line in text.split('\n'):
+        if line.strip():
+            if any(section in line for section in EN_SECTIONS):
+                formatted_lines.append(line.strip())
+            else:
+                formatted_lines.append('    ' + line.strip())
+        else:
+            formatted_lines.append('')
+    text = '\n'.join(formatted_lines)
+    text = re.sub(r'^Title\s*\n\s*(.+?)(?=\n\n)', lambda m: f'Title\n{m.group(1).upper()}', text)
+    return text.strip()
+
+
+def baseline_format_chinese(text: str, ai_patterns: List[str], transitions: List[str]) -> str:
+    """原始实现：每条规则一次 re.sub 或 str.replace"""
+    for pattern in ai_patterns:
+        text = re.sub(pattern, '', text)
+    for word in transitions:
+        text = text.replace(word, '')
+    text = re.sub(r'\*\*|\#|__', '', text)
+
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'([。！？])\s*([^，。！？、])', r'\1\n\n\2', text)
+    for section in CN_SECTIONS:
+        text = re.sub(f'({section})', r'\n\n\1\n', text)
+    text = re.sub(r'（(\d{4})）', r'[\1]', text)
+    text = re.sub(r'等人', '', text)
+    text = re.sub(r'等', '', text)
+
+    formatted_lines = []
+    for line in text.split('\n'):
+        if line.strip():
+            if any(section in line for section in CN_SECTIONS):
+                formatted_lines.append(line.strip())
+            else:
+                formatted_lines.append('    ' + line.strip())
+        else:
+            formatted_lines.append('')
+    text = '\n'.join(formatted_lines)
+    text = re.sub(r'^标题\s*\n\s*(.+?)(?=\n\n)', lambda m: f'标题\n{m.group(1)}', text)
+    text = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9，。！？、：；""（）【】《》\[\]\s\.]', '', text)
+    return text.strip()
+
+
+# 原始实现中硬编码的过渡词表，用于耗时对比
+ORIGINAL_EN_TRANSITIONS = [
+    r'\bHowever,\s+', r'\bMoreover,\s+', r'\bFurthermore,\s+',
+    r'\bTherefore,\s+', r'\bThus,\s+', r'\bHence,\s+',
+    r'\bConsequently,\s+', r'\bNevertheless,\s+', r'\bNonetheless,\s+',
+    r'\bIn addition,\s+', r'\bBesides,\s+', r'\bMeanwhile,\s+',
+    r'\bSubsequently,\s+', r'\bAs a result,\s+', r'\bFor instance,\s+',
+    r'\bFor example,\s+', r'\bIn other words,\s+', r'\bThat is to say,\s+',
+    r'\bIn conclusion,\s+', r'\bTo sum up,\s+', r'\bOverall,\s+'
+]
+ORIGINAL_CN_TRANSITIONS = [
+    '然而，', '但是，', '不过，', '因此，', '所以，',
+    '此外，', '另外，', '而且，', '并且，', '接着，',
+    '随后，', '总之，', '总而言之，', '综上所述，',
+    '例如，', '比如，', '换句话说，', '也就是说，',
+    '值得注意的是，', '需要指出的是，', '显然，', '显而易见，',
+    '毫无疑问，', '众所周知，', '一般来说，', '通常来说，'
+]
+
+
+def config_rule_tables(config: Config):
+    """按 Config 生成与 formatter 相同内容的逐条规则表"""
+    en_phrases = [p for p in config.MECHANICAL_PHRASES if p.isascii()]
+    cn_phrases = [p for p in config.MECHANICAL_PHRASES if not p.isascii()]
+    en_ai = list(_EN_AI_PATTERNS) + [rf'(?:{p}).*?\.' for p in config.PATTERNS]
+    return {
+        'en': (en_ai, [rf'\b{re.escape(p)},\s+' for p in en_phrases]),
+        'cn': (list(_CN_AI_PATTERNS), [f'{p}，' for p in cn_phrases]),
+    }
+
+
+EN_WORDS = ("model data method analysis result network learning accuracy training sample feature "
+            "system performance approach evaluation study").split()
+CN_WORDS = ["模型", "数据", "方法", "分析", "结果", "网络", "学习", "准确率", "训练", "样本", "特征", "系统"]
+
+
+def generate_document(rng: random.Random, language: str, chars: int) -> str:
+    """生成带有AI特征、过渡词、标记、章节和引用的长文档"""
+    config = Config()
+    if language == 'en':
+        phrases = [p for p in config.MECHANICAL_PHRASES if p.isascii()]
+        extras = ["I cannot verify this.", "Please note that results vary.", "As an AI model, ",
+                  "**", "##", "(2021)", "et  al.", "In my opinion this holds."]
+        sections = EN_SECTIONS
+    else:
+        phrases = [p for p in config.MECHANICAL_PHRASES if not p.isascii()]
+        extras = ["我认为结果可靠。", "请注意数据来源。", "本文提出方法。", "**", "#", "（2021）", "等人"]
+        sections = CN_SECTIONS
+
+    parts = []
+    size = 0
+    while size < chars:
+        if language == 'en':
+            words = ' '.join(rng.choice(EN_WORDS) for _ in range(rng.randint(6, 14)))
+            sentence = words.capitalize() + '. '
+            if rng.random() < 0.3:
+                sentence = f"{rng.choice(phrases)}, " + sentence
+        else:
+            sentence = ''.join(rng.choice(CN_WORDS) for _ in range(rng.randint(6, 14))) + '。'
+            if rng.random() < 0.3:
+                sentence = f"{rng.choice(phrases)}，" + sentence
+        if rng.random() < 0.1:
+            sentence += rng.choice(extras)
+        if rng.random() < 0.02:
+            sentence = f"\n\n{rng.choice(sections)}\n" + sentence
+        parts.append(sentence)
+        size += len(sentence)
+    return ''.join(parts)
+
+
+def fuzz_document(rng: random.Random, language: str) -> str:
+    """由规则片段随机拼接的短文档，容易触发规则之间的相互作用"""
+    config = Config()
+    if language == 'en':
+        phrases = [p for p in config.MECHANICAL_PHRASES if p.isascii()]
+        fragments = phrases + [", ", ". ", ".", "I cannot go", "Please note that", "As an AI ", "X", "y",
+                               "**", "##", "__", " ", "\n", "(2020)", "Title\n", "Results"]
+    else:
+        phrases = [p for p in config.MECHANICAL_PHRASES if not p.isascii()]
+        fragments = phrases + ["，", "。", "我认为x", "本文", "我们", "然", "而", "研究", "结果",
+                               "**", "#", "__", " ", "\n", "（2020）", "等", "标题\n", "摘要"]
+    return ''.join(rng.choice(fragments) for _ in range(rng.randint(1, 20)))
+
+
+def timed(function: Callable[[], str], repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='论文格式化基准测试')
+    parser.add_argument('--chars', type=int, default=400000, help='耗时测试文档的字符数')
+    parser.add_argument('--fuzz', type=int, default=10000, help='输出比较的随机文档数')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    config = Config()
+    rules = get_format_rules(config)
+    tables = config_rule_tables(config)
+    rng = random.Random(args.seed)
+
+    print(f"{'语言':<6}{'原始实现(秒)':>14}{'formatter(秒)':>16}{'加速':>8}")
+    for language, format_paper, baseline, original_transitions in (
+        ('en', format_english_paper, baseline_format_english, ORIGINAL_EN_TRANSITIONS),
+        ('cn', format_chinese_paper, baseline_format_chinese, ORIGINAL_CN_TRANSITIONS),
+    ):
+        text = generate_document(rng, language, args.chars)
+        ai_patterns = list(_EN_AI_PATTERNS if language == 'en' else _CN_AI_PATTERNS)
+        format_paper(text, rules)
+        original = timed(lambda: baseline(text, ai_patterns, original_transitions))
+        current = timed(lambda: format_paper(text, rules))
+        print(f"{language:<6}{original:>14.3f}{current:>16.3f}{original / current:>7.1f}x")
+
+    for language, format_paper, baseline in (
+        ('en', format_english_paper, baseline_format_english),
+        ('cn', format_chinese_paper, baseline_format_chinese),
+    ):
+        ai_patterns, transitions = tables[language]
+        differences = []
+        for _ in range(args.fuzz):
+            text = fuzz_document(rng, language)
+            expected = baseline(text, ai_patterns, transitions)
+            if format_paper(text, rules) != expected:
+                differences.append(text)
+        print(f"\n{language}: {len(differences)}/{args.fuzz} 篇随机文档的输出与逐条替换不同")
+        for text in differences[:3]:
+            print(f"  {text!r}")
+
+
+if __name__ == "__main__":
+    main()
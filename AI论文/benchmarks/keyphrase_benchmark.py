@@ -0,0 +1,144 @@
+"""
+英文关键短语后端基准测试 - 比较 textblob 与 rake 的吞吐量和关键词重合度
+
+用法（在 AI论文 目录下运行）：
+    python -m benchmarks.keyphrase_benchmark [文本文件 ...] [--docs 200]
+
+未指定文本文件时使用内置的英文摘要样例。textblob 后端需要先运行
+python -m textblob.download_corpora 下载模型，模型不可用时只测试 rake。
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, List, Optional
+
+from analyzer import KEYPHRASE_BACKENDS, TopicAnalyzer, _get_blobber
+
+SAMPLE_ABSTRACTS = [
+    "Deep learning models have achieved remarkable accuracy in medical image analysis. "
+    "We propose a convolutional neural network for tumor detection in chest radiographs. "
+    "The network is trained on a large annotated dataset and evaluated against expert radiologists. "
+    "Experimental results show that the proposed model improves detection accuracy while reducing false positives.",
+
+    "Natural language processing techniques enable automatic analysis of electronic health records. "
+    "This paper presents a transformer-based model for clinical text classification. "
+    "We compare the model with traditional machine learning baselines on three public benchmarks. "
+    "The transformer model outperforms the baselines and generalizes well to unseen hospitals.",
+
+    "Graph neural networks provide a flexible framework for learning on relational data. "
+    "We study message passing neural networks for molecular property prediction. "
+    "A new attention mechanism aggregates neighbor features and improves prediction of solubility and toxicity. "
+    "Ablation studies confirm the contribution of each component of the architecture.",
+
+    "Reinforcement learning has been applied to robotic manipulation with increasing success. "
+    "We introduce a sample-efficient policy optimization method that combines model-based planning "
+    "with model-free value estimation. Simulated and real robot experiments demonstrate faster "
+    "learning and higher success rates than prior reinforcement learning methods.",
+
+    "Federated learning allows multiple institutions to train a shared model without exchanging raw data. "
+    "We analyze communication cost and privacy leakage in federated optimization. "
+    "A compression scheme for model updates reduces communication by an order of magnitude "
+    "while differential privacy guarantees protect individual records.",
+
+    "Large language models can generate fluent text but often produce factual errors. "
+    "We evaluate retrieval-augmented generation for scientific question answering. "
+    "Retrieved passages from a literature index ground the language model and reduce hallucinated citations. "
+    "Human evaluation shows improved factual accuracy and citation quality.",
+]
+
+
+def load_texts(paths: List[str], docs: int) -> List[str]:
+    """读取文本文件，未指定时循环使用内置样例，凑满 docs 篇"""
+    texts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    texts = texts or SAMPLE_ABSTRACTS
+    return [texts[i % len(texts)] for i in range(max(docs, len(texts)))]
+
+
+def textblob_available() -> bool:
+    """检查 textblob 的词性标注和名词短语模型是否可用"""
+    try:
+        blob = _get_blobber()("Benchmark warm up.")
+        blob.tags
+        blob.noun_phrases
+        return True
+    except Exception:
+        return False
+
+
+def run_backend(backend: str, texts: List[str]) -> Dict:
+    """用指定后端分析所有文本，返回耗时和每篇的结果"""
+    analyzer = TopicAnalyzer(idf_index_path='', keyphrase_backend=backend)
+    # 先分析一篇，排除模型加载时间
+    analyzer.analyze(texts[0])
+    start = time.perf_counter()
+    results = [analyzer.analyze(text) for text in texts]
+    return {'seconds': time.perf_counter() - start, 'results': results}
+
+
+def jaccard(a: List[str], b: List[str]) -> float:
+    a = {word.lower() for word in a}
+    b = {word.lower() for word in b}
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def compare(reference: List[Dict], candidate: List[Dict]) -> Dict[str, float]:
+    """
+    计算两个后端结果的重合度
+
+    Returns:
+        Dict[str, float]: 关键词平均 Jaccard 相似度，以及主题至少共享一个词的比例
+    """
+    keyword_overlap = [
+        jaccard(ref['keywords']['en'], cand['keywords']['en'])
+        for ref, cand in zip(reference, candidate)
+    ]
+    topic_match = [
+        bool(set(ref['topic']['en'].lower().split()) & set(cand['topic']['en'].lower().split()))
+        for ref, cand in zip(reference, candidate)
+    ]
+    return {
+        'keyword_jaccard': sum(keyword_overlap) / len(keyword_overlap),
+        'topic_match': sum(topic_match) / len(topic_match)
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='英文关键短语后端基准测试')
+    parser.add_argument('files', nargs='*', help='英文文本文件，每个文件作为一篇文档')
+    parser.add_argument('--docs', type=int, default=200, help='分析的文档篇数，不足时循环使用')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    texts = load_texts(args.files, args.docs)
+    chars = sum(len(text) for text in texts)
+
+    backends = list(KEYPHRASE_BACKENDS)
+    if not textblob_available():
+        print("textblob 模型不可用，只测试 rake（请先运行 python -m textblob.download_corpora）")
+        backends.remove('textblob')
+
+    runs = {backend: run_backend(backend, texts) for backend in backends}
+
+    print(f"\n文档数: {len(texts)}，总字符数: {chars}")
+    print(f"{'后端':<10}{'耗时(秒)':>12}{'文档/秒':>12}{'字符/秒':>14}")
+    for backend, run in runs.items():
+        seconds = max(run['seconds'], 1e-9)
+        print(f"{backend:<10}{run['seconds']:>12.3f}{len(texts) / seconds:>12.1f}{chars / seconds:>14.0f}")
+
+    if 'textblob' in runs:
+        overlap = compare(runs['textblob']['results'], runs['rake']['results'])
+        speedup = runs['textblob']['seconds'] / max(runs['rake']['seconds'], 1e-9)
+        print(f"\nrake 相对 textblob 加速: {speedup:.1f}x")
+        print(f"关键词平均 Jaccard 相似度: {overlap['keyword_jaccard']:.2f}")
+        print(f"主题至少共享一个词的比例: {overlap['topic_match']:.0%}")
+
+    sample = runs['rake']['results'][0]
+    print(f"\nrake 样例结果: 主题={sample['topic']['en']!r}，关键词={sample['keywords']['en']}")
+
+
+if __name__ == "__main__":
+    main()
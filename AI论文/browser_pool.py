@@ -0,0 +1,188 @@
+"""
+浏览器池模块 - 复用预热的 WebDriver 实例及其持久化的浏览器用户配置
+"""
+
+import atexit
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 登录完成后写入用户配置目录的标记文件
+LOGIN_MARKER = ".metaso_login"
+
+DriverFactory = Callable[[str, bool], Any]
+
+
+class BrowserPool:
+    """WebDriver 实例池，每个实例独占一个持久化的用户配置目录"""
+
+    def __init__(self, factory: DriverFactory, size: int = 2,
+                 profile_root: str = "output/browser_profiles", headless: bool = False):
+        """
+        初始化浏览器池
+
+        Args:
+            factory: 创建驱动的函数，接收 (用户配置目录, 是否无头)
+            size: 最多同时存在的浏览器实例数
+            profile_root: 用户配置目录的根目录，第 i 个实例使用 profile_root/profile_i
+            headless: 是否以无头模式启动浏览器
+        """
+        if size < 1:
+            raise ValueError("浏览器池大小必须大于0")
+        self.factory = factory
+        self.size = size
+        self.profile_root = profile_root
+        self.headless = headless
+        self._idle: List[Tuple[Any, str]] = []
+        self._free_profiles = [os.path.join(profile_root, f"profile_{i}") for i in range(size)]
+        self._profiles: Dict[int, str] = {}
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def _create(self, profile_dir: str) -> Any:
+        os.makedirs(profile_dir, exist_ok=True)
+        driver = self.factory(profile_dir, self.headless)
+        self._profiles[id(driver)] = profile_dir
+        logger.info(f"已启动浏览器实例: {profile_dir}")
+        return driver
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        取出一个浏览器实例，没有空闲实例且未达上限时新建
+
+        Args:
+            timeout: 等待空闲实例的最长时间（秒），None 表示一直等待
+
+        Returns:
+            WebDriver 实例
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._closed or self._idle or self._free_profiles, timeout=timeout
+            ):
+                raise TimeoutError("等待可用浏览器实例超时")
+            if self._closed:
+                raise RuntimeError("浏览器池已关闭")
+            if self._idle:
+                return self._idle.pop()[0]
+            profile_dir = self._free_profiles.pop()
+
+        try:
+            return self._create(profile_dir)
+        except Exception:
+            with self._condition:
+                self._free_profiles.append(profile_dir)
+                self._condition.notify()
+            raise
+
+    def release(self, driver: Any, discard: bool = False):
+        """
+        归还浏览器实例
+
+        Args:
+            driver: 之前取出的实例
+            discard: 为True时关闭实例（例如浏览器已崩溃），释放其用户配置目录
+        """
+        with self._condition:
+            profile_dir = self._profiles.get(id(driver))
+            if discard or self._closed:
+                self._profiles.pop(id(driver), None)
+                if profile_dir:
+                    self._free_profiles.append(profile_dir)
+            else:
+                self._idle.append((driver, profile_dir))
+            self._condition.notify()
+
+        if discard or self._closed:
+            _quit(driver)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """以上下文管理器的方式使用浏览器实例，出错时丢弃该实例"""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def profile_dir(self, driver: Any) -> Optional[str]:
+        """返回实例使用的用户配置目录"""
+        return self._profiles.get(id(driver))
+
+    def is_logged_in(self, driver: Any) -> bool:
+        """用户配置是否已完成过登录"""
+        profile_dir = self.profile_dir(driver)
+        return bool(profile_dir) and os.path.exists(os.path.join(profile_dir, LOGIN_MARKER))
+
+    def mark_logged_in(self, driver: Any):
+        """记录该用户配置已完成登录，之后可无人值守运行"""
+        profile_dir = self.profile_dir(driver)
+        if profile_dir:
+            with open(os.path.join(profile_dir, LOGIN_MARKER), 'w', encoding='utf-8') as f:
+                f.write("ok\n")
+
+    def warm(self, count: Optional[int] = None):
+        """
+        预先启动浏览器实例，供批处理或工作进程初始化时调用
+
+        Args:
+            count: 预热的实例数，默认预热到池的上限
+        """
+        drivers = []
+        try:
+            for _ in range(min(count or self.size, self.size)):
+                drivers.append(self.acquire(timeout=0))
+        except TimeoutError:
+            pass
+        finally:
+            for driver in drivers:
+                self.release(driver)
+
+    def close(self):
+        """关闭所有空闲实例"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver, _ in idle:
+            _quit(driver)
+
+
+def _quit(driver: Any):
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.error(f"关闭浏览器失败: {str(e)}")
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool(factory: DriverFactory, size: int = 2,
+                     profile_root: str = "output/browser_profiles", headless: bool = False) -> BrowserPool:
+    """
+    获取进程内共享的浏览器池，首次调用时创建
+
+    Args:
+        factory: 创建驱动的函数
+        size: 首次创建时的池大小
+        profile_root: 首次创建时的用户配置根目录
+        headless: 首次创建时是否使用无头模式
+
+    Returns:
+        BrowserPool: 共享浏览器池
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = BrowserPool(factory, size=size, profile_root=profile_root, headless=headless)
+            atexit.register(_pool.close)
+        return _pool
@@ -24,7 +24,50 @@ class Config:
     
     # 性能配置
     CACHE_SIZE: int = 100
-    TIMEOUT: int = 30
+    TIMEOUT: int = 30  # 秒，建立连接的超时
+    READ_TIMEOUT: int = 300  # 秒，流式响应中等待下一段数据的超时，0 表示不限
+    
+    # 响应缓存配置
+    CACHE_ENABLED: bool = True
+    CACHE_DIR: str = 'output/cache'
+    CACHE_TTL: int = 7 * 24 * 3600  # 秒
+    CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    
+    # PDF解析配置（0 表示不限制）
+    PDF_MAX_CHARS: int = 0
+    PDF_MAX_PAGES: int = 0
+    PDF_PARALLEL_MIN_PAGES: int = 200
+    
+    # 提示词预算配置（单位：token）
+    CONTEXT_WINDOW: int = 128000
+    RESERVED_OUTPUT_TOKENS: int = 16000
+    REFERENCE_TOKEN_BUDGET: int = 24000
+    CHUNK_TOKENS: int = 8000
+    
+    # 爬虫配置
+    CRAWLER_HEADLESS: bool = False
+    CRAWLER_POOL_SIZE: int = 2
+    CRAWLER_PROFILE_DIR: str = 'output/browser_profiles'
+    CRAWLER_WAIT_TIMEOUT: int = 60  # 秒，等待页面元素出现的上限
+    EDGE_DRIVER_PATH: str = ''  # 固定的 msedgedriver 路径，为空时自动解析并缓存
+    EDGE_DRIVER_AUTO_DOWNLOAD: bool = False  # 找不到匹配的驱动时自动联网下载，默认只在 --refresh-driver 时联网
+    CRAWL_MAX_QUERIES: int = 4  # 每次爬取最多执行的子查询数
+    CRAWL_KEYWORDS_PER_QUERY: int = 2
+    CRAWL_DEADLINE: int = 300  # 秒，所有子查询的总时限
+    CRAWL_CACHE_TTL: int = 24 * 3600  # 秒，爬取结果保持新鲜的时长，0 表示不缓存
+    CRAWL_CACHE_STALE_TTL: int = 6 * 24 * 3600  # 秒，过期后仍先返回旧结果并后台刷新的时长
+    DEDUP_THRESHOLD: float = 0.7  # 估计的 Jaccard 相似度达到该值时视为重复文献
+    DEDUP_NUM_PERM: int = 64
+    DEDUP_BANDS: int = 16
+    DEDUP_MAX_ENTRIES: int = 50000  # 持久化去重索引保留的最多文献数，超出时淘汰最早加入的，0 表示不限制
+    RANK_RECENCY_WEIGHT: float = 0.2  # 文献排序中新近度的权重，其余为相关性
+    RANK_HALF_LIFE_YEARS: float = 5.0
+    
+    # 主题分析配置
+    IDF_INDEX_PATH: str = 'output/idf_index'  # 语料IDF索引目录，为空时使用 jieba 自带的IDF
+    IDF_MIN_DOCUMENTS: int = 200  # 语料文档数达到该值后才使用语料IDF，之前只用 jieba 自带的IDF
+    IDF_PRIOR_DOCUMENTS: int = 1000  # 语料IDF的混合权重为 N/(N+该值)，其余取 jieba 的IDF；未收录的词只用 jieba 的IDF
+    KEYPHRASE_BACKEND: str = 'textblob'  # 英文关键短语后端：textblob，或不依赖词性标注模型、更快的 rake
     
     # 文件配置
     INPUT_FORMATS: List[str] = field(default_factory=lambda: ['.pdf', '.txt', '.docx'])
@@ -63,32 +106,6 @@ class Config:
         'remove_duplicates': True   # 移除重复内容
     })
     
-    # 要移除的机械化表达
-    MECHANICAL_PHRASES: List[str] = field(default_factory=lambda: [
-        "然而", "However",
-        "首先", "First",
-        "其次", "Second",
-        "总结", "In summary",
-        "随后", "Subsequently",
-        "总而言之", "In conclusion",
-        "最后", "Finally",
-        "此外", "Moreover",
-        "因此", "Therefore",
-        "总之", "In general",
-        "尤其是", "Especially",
-        "另外", "Additionally",
-        "这个", "This",
-        "**", "*",
-        "特别是", "Particularly",
-        "值得注意的是", "Notably",
-        "需要指出的是", "It should be noted",
-        "不难发现", "It is easy to find",
-        "通过分析", "Through analysis",
-        "根据上述", "Based on the above",
-        "由此可见", "Thus it can be seen",
-        "综上所述", "In summary"
-    ])
-    
     # OpenAI API配置
     OPENAI_API_KEY: str = os.getenv('OPENAI_API_KEY', '')
     
@@ -232,30 +249,42 @@ Requirements:
    - 避免过度推广
    - 注意研究的边界"""
 
-    # 需要移除的机械化词语
+    # 需要移除的机械化词语（后接逗号时作为过渡词移除）
     MECHANICAL_PHRASES: List[str] = field(default_factory=lambda: [
-        # 中文过渡词
-        "然而", "首先", "其次", "总结", "随后", "总而言之",
-        "总之", "尤其是", "另外", "这个", "特别是", "值得注意的是",
-        "需要指出的是", "不难发现", "通过分析", "根据上述", "由此可见",
-        "综上所述", "因此", "所以", "但是", "不过", "接着", "最后",
-        "此外", "同时", "此时", "从而", "于是", "故而", "以及",
-        "并且", "而且", "不仅如此", "除此之外", "换句话说", "换言之",
-        "简言之", "具体来说", "具体而言", "总的来说", "总的来看",
-        "事实上", "显然", "显而易见", "毫无疑问", "众所周知",
-        "一般来说", "一般而言", "一般来讲", "通常来说", "通常而言",
+        # 中文过渡词（后接全角逗号时删除）
+        "然而", "但是", "不过", "因此", "所以",
+        "此外", "另外", "而且", "并且", "接着",
+        "随后", "总之", "总而言之", "综上所述",
+        "例如", "比如", "换句话说", "也就是说",
+        "值得注意的是", "需要指出的是", "显然", "显而易见",
+        "毫无疑问", "众所周知", "一般来说", "通常来说",
+        
+        # English transition words (removed when followed by a comma)
+        "However", "Moreover", "Furthermore",
+        "Therefore", "Thus", "Hence",
+        "Consequently", "Nevertheless", "Nonetheless",
+        "In addition", "Besides", "Meanwhile",
+        "Subsequently", "As a result", "For instance",
+        "For example", "In other words", "That is to say",
+        "In conclusion", "To sum up", "Overall"
+    ])
+    
+    # 更激进的过渡词表，包含“这个”“This”“First”等常用词，REMOVE_EXTRA_MECHANICAL_PHRASES 为True时才删除
+    REMOVE_EXTRA_MECHANICAL_PHRASES: bool = False
+    EXTRA_MECHANICAL_PHRASES: List[str] = field(default_factory=lambda: [
+        "首先", "其次", "总结", "尤其是", "这个", "特别是",
+        "不难发现", "通过分析", "根据上述", "由此可见", "最后",
+        "同时", "此时", "从而", "于是", "故而", "以及",
+        "不仅如此", "除此之外", "换言之", "简言之", "具体来说", "具体而言",
+        "总的来说", "总的来看", "事实上", "一般而言", "一般来讲", "通常而言",
         
-        # English transition words
-        "However", "First", "Second", "In summary", "Subsequently",
-        "In conclusion", "Therefore", "Especially", "Additionally",
+        "First", "Second", "In summary", "Especially", "Additionally",
         "This", "Particularly", "It is worth noting", "It should be noted",
-        "Through analysis", "Based on the above", "Thus", "Hence",
-        "Moreover", "Furthermore", "Nevertheless", "Nonetheless",
-        "Meanwhile", "Consequently", "As a result", "In addition",
-        "Besides", "In other words", "That is to say", "In brief",
+        "Through analysis", "Based on the above", "In brief",
         "Specifically", "Generally speaking", "In general", "Obviously",
         "Evidently", "Without doubt", "As is known to all",
-        "Usually", "Typically", "Normally", "In most cases"
+        "Usually", "Typically", "Normally", "In most cases",
+        "Finally", "Notably", "It is easy to find", "Thus it can be seen"
     ])
     
     @classmethod
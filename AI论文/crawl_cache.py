@@ -0,0 +1,143 @@
+"""
+爬取结果缓存模块 - 按规范化查询缓存解析后的文献列表，过期后先返回旧结果再后台刷新
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from paper import Paper, dumps_papers, loads_papers
+from response_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    规范化查询：全角转半角、转小写、合并空白
+
+    Args:
+        query: 原始查询
+
+    Returns:
+        str: 规范化后的查询
+    """
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFKC', query)).strip().lower()
+
+
+class CrawlCache:
+    """文献爬取结果缓存，条目在 ttl 内视为新鲜，在随后的 stale_ttl 内可先返回再刷新"""
+
+    def __init__(self, path: str, ttl: int = 24 * 3600, stale_ttl: int = 6 * 24 * 3600,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        初始化爬取结果缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            ttl: 结果保持新鲜的时长（秒）
+            stale_ttl: 过期后仍可返回旧结果的时长（秒），超过后视为未命中
+            max_bytes: 缓存内容的总字节上限
+        """
+        self.ttl = ttl
+        self.disk = DiskCache(path, ttl=ttl + stale_ttl, max_bytes=max_bytes)
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str) -> str:
+        return hashlib.sha256(normalize_query(query).encode('utf-8')).hexdigest()
+
+    def get(self, query: str) -> Tuple[Optional[List[Paper]], bool]:
+        """
+        读取查询的缓存结果
+
+        Args:
+            query: 查询
+
+        Returns:
+            Tuple[Optional[List[Paper]], bool]: (文献列表, 是否已过期)，未命中时文献列表为 None
+        """
+        try:
+            entry = self.disk.get_entry(self._key(query))
+        except sqlite3.Error as e:
+            logger.error(f"读取爬取缓存失败: {str(e)}")
+            return None, False
+        if entry is None:
+            return None, False
+        value, created = entry
+        return loads_papers(value), time.time() - created > self.ttl
+
+    def set(self, query: str, papers: List[Paper]):
+        """写入查询的结果"""
+        try:
+            self.disk.set(self._key(query), dumps_papers(papers))
+        except sqlite3.Error as e:
+            logger.error(f"写入爬取缓存失败: {str(e)}")
+
+    def revalidate(self, query: str, fetch: Callable[[str], List[Paper]]):
+        """
+        在后台线程中重新爬取查询并更新缓存，同一查询同时只刷新一次
+
+        刷新线程不是守护线程，进程退出前会等待刷新完成并写入缓存。
+
+        Args:
+            query: 查询
+            fetch: 实际执行爬取的函数
+        """
+        key = self._key(query)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+
+        def run():
+            try:
+                papers = fetch(query)
+                if papers:
+                    self.set(query, papers)
+                    logger.info(f"已刷新爬取缓存: {query}")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        threading.Thread(target=run, name="crawl-cache-revalidate").start()
+
+
+_caches: Dict[str, CrawlCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_crawl_cache(config: Config) -> Optional[CrawlCache]:
+    """
+    获取进程内共享的爬取结果缓存
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        Optional[CrawlCache]: 缓存实例，未启用缓存时返回 None
+    """
+    if not config.CACHE_ENABLED or not config.CACHE_DIR or config.CRAWL_CACHE_TTL <= 0:
+        return None
+    path = os.path.join(config.CACHE_DIR, 'crawl.sqlite3')
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = CrawlCache(
+                path,
+                ttl=config.CRAWL_CACHE_TTL,
+                stale_ttl=config.CRAWL_CACHE_STALE_TTL,
+                max_bytes=config.CACHE_MAX_BYTES
+            )
+            _caches[path] = cache
+        return cache
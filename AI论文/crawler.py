@@ -3,59 +3,167 @@
 """
 
 import logging
-from typing import List, Dict
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
 from selenium import webdriver # type: ignore
 from selenium.webdriver.common.by import By # type: ignore
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+)
 import re
 import urllib.parse
 import os
+from config import Config
+from browser_pool import get_browser_pool
+from crawl_cache import get_crawl_cache
+from dedup import load_index
+from paper import Paper
+from ranking import rank_papers
+from driver_manager import get_edge_service
+from reference_renderer import render_references
 
 logger = logging.getLogger(__name__)
 
+# 秘塔搜索页面元素
+SEARCH_BOX_SELECTOR = "textarea.search-consult-textarea"
+ACADEMIC_TAB_SELECTOR = "button.MuiTab-root.search-domain-kits_search-domain-tab__4O_vu"
+REFERENCE_BUTTON_SELECTOR = "button.Search_answer-link-btn__Od5C7"
+RESULT_SELECTOR = "#search-page-scroller > div > div > div.MuiStack-root.Search_search-result__louwQ"
+RESULT_ITEM_SELECTOR = "div.MuiStack-root > div"
+
+# 跨运行持久化的去重索引文件（位于 CACHE_DIR 下）
+DEDUP_INDEX_FILE = "dedup_index.npz"
+
+# 在页面中一次性取回所有结果条目的文本、链接和PDF标记
+_EXTRACT_RESULTS_SCRIPT = """
+const container = document.querySelector(arguments[0]);
+if (!container) {
+    return [];
+}
+return Array.from(container.querySelectorAll(arguments[1]), item => {
+    const links = Array.from(item.querySelectorAll('a[href]'), a => a.href);
+    return {
+        text: item.innerText || '',
+        links: links,
+        isPdf: links.some(href => /\\.pdf(?:$|[?#])/i.test(href))
+    };
+});
+"""
+
+_DATE_RE = re.compile(r'\[(\d{4}-\d{2}-\d{2})\]')
+_PDF_LINK_RE = re.compile(r'\.pdf(?:$|[?#])', re.IGNORECASE)
+
+
+def _parse_result_text(text_content: str) -> Optional[Paper]:
+    """
+    从单个结果条目的文本中解析标题、来源、日期和PDF标记
+    
+    Args:
+        text_content: 条目的完整文本
+        
+    Returns:
+        Optional[Paper]: 文献记录，内容过短或没有标题时返回 None
+    """
+    if not text_content or len(text_content.strip()) < 10:  # 跳过空内容或太短的内容
+        return None
+        
+    title = ""
+    source = []
+    date = ""
+    is_pdf = False
+    
+    for line in text_content.split('\n'):
+        # 检查是否包含PDF标记
+        if "PDF" in line:
+            is_pdf = True
+            # 移除PDF标记后的内容作为标题
+            title = line.replace("PDF", "").strip()
+            continue
+        # 检查是否包含日期
+        match = _DATE_RE.search(line)
+        if match:
+            date = match.group(1)
+        # 其他内容可能是来源
+        elif line and not title:
+            title = line
+        elif line:
+            source.append(line)
+            
+    if not title:
+        return None
+    return Paper(
+        title=title,
+        source=" ".join(source).strip(),
+        date=date,
+        is_pdf=is_pdf,
+        content=text_content  # 保存完整文本以备需要
+    )
+
+
 class LiteratureCrawler:
     """文献爬虫类，使用秘塔搜索获取相关文献"""
     
-    def __init__(self):
-        """初始化爬虫"""
-        self.driver = None
+    def __init__(self, output_dir: str = "output", job_id: Optional[str] = None, headless: Optional[bool] = None,
+                 refresh_driver: bool = False, refresh_crawl: bool = False):
+        """
+        初始化爬虫
+        
+        Args:
+            output_dir: 参考文献文件的输出目录
+            job_id: 任务标识，指定后参考文献保存到 output_dir/job_id/ 下，避免多个任务互相覆盖
+            headless: 是否以无头模式运行，None 时使用配置中的 CRAWLER_HEADLESS
+            refresh_driver: 是否忽略驱动缓存，联网重新解析 Edge 驱动
+            refresh_crawl: 是否忽略爬取结果缓存，重新爬取（结果仍会写入缓存）
+        """
+        self.config = Config()
+        self.pool = None
+        self._login_lock = threading.Lock()
+        self._driver_lock = threading.Lock()
         self.base_url = "https://metaso.cn"
         self.wait_timeout = 10
-        # 创建output目录（如果不存在）
-        if not os.path.exists('output'):
-            os.makedirs('output')
-            
-    def save_references(self, papers: List[Dict], output_file: str = "output/references.txt"):
+        self.result_timeout = self.config.CRAWLER_WAIT_TIMEOUT
+        self.headless = self.config.CRAWLER_HEADLESS if headless is None else headless
+        self.refresh_driver = refresh_driver
+        self.refresh_crawl = refresh_crawl
+        self.crawl_cache = get_crawl_cache(self.config)
+        self.output_dir = os.path.join(output_dir, job_id) if job_id else output_dir
+            
+    def save_references(self, papers: List[Paper], output_file: Optional[str] = None):
         """保存参考文献到文件"""
+        output_file = output_file or os.path.join(self.output_dir, "references.txt")
         try:
+            directory = os.path.dirname(output_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("# 参考文献列表\n\n")
-                for i, paper in enumerate(papers, 1):
-                    f.write(f"## 文献 {i}\n")
-                    f.write(f"标题: {paper['title']}\n")
-                    if paper['date']:
-                        f.write(f"日期: {paper['date']}\n")
-                    f.write(f"来源: {paper['source']}\n")
-                    f.write(f"内容:\n{paper['content']}\n")
-                    f.write("\n" + "-"*80 + "\n\n")
+                f.write(render_references(papers))
             logger.info(f"参考文献已保存到: {output_file}")
             return output_file
         except Exception as e:
             logger.error(f"保存参考文献时出错: {str(e)}")
             return None
             
-    def _setup_driver(self):
-        """设置浏览器驱动"""
+    def _create_driver(self, profile_dir: str, headless: bool):
+        """
+        创建使用指定用户配置目录的 Edge 驱动，供浏览器池调用
+        
+        Args:
+            profile_dir: 持久化的用户配置目录，登录状态保存在其中
+            headless: 是否以无头模式启动
+        """
         try:
             # 使用 Edge
             options = webdriver.EdgeOptions()
             
+            # 复用持久化的用户配置，保留登录状态
+            options.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
+            if headless:
+                options.add_argument('--headless=new')
+            
             # 基本设置
             options.add_argument('--disable-gpu')
             options.add_argument('--no-sandbox')
@@ -65,50 +173,92 @@ class LiteratureCrawler:
             # 设置用户代理
             options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36 Edg/130.0.2849.56')
             
-            # 创建服务
-            service = EdgeService(EdgeChromiumDriverManager().install())
+            # 连接共享的驱动服务，刷新已在 _setup_driver 中完成，这里不会重启服务
+            service = get_edge_service(self.config)
             
             # 初始化驱动
-            self.driver = webdriver.Edge(service=service, options=options)
+            driver = webdriver.Remote(command_executor=service.service_url, options=options)
             
             # 设置页面加载超时
-            self.driver.set_page_load_timeout(30)
+            driver.set_page_load_timeout(30)
             
             logger.info("Edge 浏览器初始化成功")
+            return driver
             
         except Exception as e:
             logger.error(f"浏览器初始化失败: {str(e)}")
             raise
+            
+    def _setup_driver(self):
+        """获取共享的浏览器池，浏览器实例在查询时按需取出"""
+        # 要求刷新时在浏览器池创建驱动之前重新解析一次，避免并发创建时重启正在使用的服务
+        with self._driver_lock:
+            if self.refresh_driver:
+                get_edge_service(self.config, refresh=True)
+                self.refresh_driver = False
                 
-    def _close_driver(self):
-        """关闭浏览器驱动"""
-        if self.driver:
-            try:
-                self.driver.quit()
-                logger.info("浏览器已关闭")
-            except Exception as e:
-                logger.error(f"关闭浏览器失败: {str(e)}")
-            finally:
-                self.driver = None
+        self.pool = get_browser_pool(
+            self._create_driver,
+            size=self.config.CRAWLER_POOL_SIZE,
+            profile_root=self.config.CRAWLER_PROFILE_DIR,
+            headless=self.headless
+        )
+                
+    def _ensure_logged_in(self, driver, interactive: bool = True):
+        """确认当前浏览器配置已登录，首次使用时等待用户手动登录，非交互模式下直接报错"""
+        if self.pool.is_logged_in(driver):
+            logger.info("浏览器配置已登录，跳过手动登录")
+            return
+        if self.headless:
+            raise RuntimeError("浏览器配置尚未登录，请先以非无头模式运行一次完成登录")
+        if not interactive:
+            raise RuntimeError("浏览器配置尚未登录，非交互模式下跳过")
+            
+        # 多个查询并发时逐个提示登录
+        with self._login_lock:
+            input("请先完成登录，完成后按回车继续...")
+            logger.info("用户已确认登录完成")
+            self.pool.mark_logged_in(driver)
                 
-    def _search_metaso(self, query: str):
-        """在秘塔搜索中执行搜索"""
+    def _login_pool(self, count: int):
+        """
+        在主线程中确认将要使用的浏览器配置都已登录，之后并发的查询不会再等待用户输入
+        
+        Args:
+            count: 需要同时使用的浏览器实例数
+        """
+        drivers = []
+        try:
+            for _ in range(min(count, self.pool.size)):
+                drivers.append(self.pool.acquire(timeout=self.config.CRAWL_DEADLINE))
+            for driver in drivers:
+                if not self.pool.is_logged_in(driver):
+                    driver.get(self.base_url)
+                    self._ensure_logged_in(driver)
+        finally:
+            for driver in drivers:
+                self.pool.release(driver)
+                
+    def _needs_browser(self, queries: List[str]) -> int:
+        """没有缓存结果、需要实际爬取的查询数"""
+        if self.crawl_cache is None or self.refresh_crawl:
+            return len(queries)
+        return sum(1 for query in queries if self.crawl_cache.get(query)[0] is None)
+        
+    def _search_metaso(self, query: str, driver, interactive: bool = True):
+        """在秘塔搜索中执行搜索，interactive 为 False 时不提示用户登录"""
         try:
             # 访问秘塔搜索
             logger.info(f"正在访问: {self.base_url}")
-            self.driver.get(self.base_url)
+            driver.get(self.base_url)
             logger.info("已访问秘塔搜索首页")
             
-            # 等待用户登录
-            input("请先完成登录，完成后按回车继续...")
-            logger.info("用户已确认登录完成")
-            
-            # 等待页面加载
-            time.sleep(5)
+            # 未登录的浏览器配置需要用户先完成登录
+            self._ensure_logged_in(driver, interactive=interactive)
             
-            # 定位搜索框
-            search_box = WebDriverWait(self.driver, self.wait_timeout).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "textarea.search-consult-textarea"))
+            # 等待搜索框加载完成
+            search_box = WebDriverWait(driver, self.wait_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, SEARCH_BOX_SELECTOR))
             )
             
             # 清空搜索框并输入查询
@@ -120,37 +270,32 @@ class LiteratureCrawler:
             search_box.send_keys(Keys.RETURN)
             logger.info("已按下回车键")
             
-            # 等待搜索结果加载
-            time.sleep(40)
-            
-            # 点击"学术"按钮
+            # 等待搜索结果生成后点击"学术"按钮
             try:
-                academic_button = WebDriverWait(self.driver, self.wait_timeout * 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button.MuiTab-root.search-domain-kits_search-domain-tab__4O_vu"))
+                academic_button = WebDriverWait(driver, self.result_timeout).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, ACADEMIC_TAB_SELECTOR))
                 )
                 academic_button.click()
                 logger.info("已点击学术按钮")
-                time.sleep(10)
             except Exception as e:
                 logger.error(f"点击学术按钮失败: {str(e)}")
                 raise
                 
             # 点击参考文献链接
             try:
-                reference_button = WebDriverWait(self.driver, self.wait_timeout * 2).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, "button.Search_answer-link-btn__Od5C7"))
+                reference_button = WebDriverWait(driver, self.result_timeout).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, REFERENCE_BUTTON_SELECTOR))
                 )
                 reference_button.click()
                 logger.info("已点击参考文献链接")
-                time.sleep(10)
             except Exception as e:
                 logger.error(f"点击参考文献链接失败: {str(e)}")
                 raise
             
             # 等待数据加载完成
             try:
-                WebDriverWait(self.driver, self.wait_timeout * 2).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "#search-page-scroller > div > div > div.MuiStack-root.Search_search-result__louwQ"))
+                WebDriverWait(driver, self.result_timeout).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, RESULT_SELECTOR))
                 )
                 logger.info("数据加载完成")
             except Exception as e:
@@ -164,69 +309,75 @@ class LiteratureCrawler:
             logger.error(f"搜索过程出错: {str(e)}")
             raise
             
+    def _wait_for_stable_results(self, driver):
+        """等待文献条目数量在相邻两次轮询之间不再变化，即结果已加载完成"""
+        last_count = -1
+        
+        def results_stable(d):
+            nonlocal last_count
+            container = d.find_element(By.CSS_SELECTOR, RESULT_SELECTOR)
+            count = len(container.find_elements(By.CSS_SELECTOR, RESULT_ITEM_SELECTOR))
+            stable = count > 0 and count == last_count
+            last_count = count
+            return stable
+            
+        try:
+            WebDriverWait(
+                driver, self.wait_timeout, poll_frequency=1,
+                ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+            ).until(results_stable)
+        except TimeoutException:
+            logger.warning(f"搜索结果仍在变化，按当前的 {max(last_count, 0)} 个条目解析")
+            
+    def _extract_results_bulk(self, driver) -> Optional[List[Dict]]:
+        """一次脚本调用取回所有条目的文本、链接和PDF标记，失败时返回 None"""
+        try:
+            items = driver.execute_script(_EXTRACT_RESULTS_SCRIPT, RESULT_SELECTOR, RESULT_ITEM_SELECTOR)
+        except WebDriverException as e:
+            logger.warning(f"批量提取搜索结果失败，改为逐条读取: {str(e)}")
+            return None
+        return items if isinstance(items, list) else None
+        
+    def _extract_results_per_element(self, driver) -> List[Dict]:
+        """逐条读取搜索结果，每个条目需要多次 WebDriver 往返"""
+        results_container = driver.find_element(By.CSS_SELECTOR, RESULT_SELECTOR)
+        items = []
+        for result in results_container.find_elements(By.CSS_SELECTOR, RESULT_ITEM_SELECTOR):
+            try:
+                links = [link.get_attribute('href') or '' for link in result.find_elements(By.CSS_SELECTOR, 'a[href]')]
+                items.append({
+                    "text": result.text,
+                    "links": links,
+                    "isPdf": any(_PDF_LINK_RE.search(link) for link in links)
+                })
+            except Exception as e:
+                logger.error(f"解析单个结果时出错: {str(e)}")
+        return items
+        
     def _parse_search_results(self, driver):
         try:
             # 等待搜索结果加载
-            result_selector = "#search-page-scroller > div > div > div.MuiStack-root.Search_search-result__louwQ"
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, result_selector))
+            WebDriverWait(driver, self.result_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, RESULT_SELECTOR))
             )
             
-            # 等待一下确保结果完全加载
-            time.sleep(5)
-            
-            # 获取结果容器
-            results_container = driver.find_element(By.CSS_SELECTOR, result_selector)
+            # 等待结果条目数量稳定
+            self._wait_for_stable_results(driver)
             
-            # 获取所有文献条目
-            results = results_container.find_elements(By.CSS_SELECTOR, "div.MuiStack-root > div")
+            # 取回所有文献条目
+            items = self._extract_results_bulk(driver)
+            if items is None:
+                items = self._extract_results_per_element(driver)
+                
             parsed_results = []
-            
-            for result in results:
-                try:
-                    # 获取文献信息
-                    text_content = result.text
-                    if not text_content or len(text_content.strip()) < 10:  # 跳过空内容或太短的内容
-                        continue
-                        
-                    # 按行分割内容
-                    lines = text_content.split('\n')
-                    
-                    # 解析信息
-                    title = ""
-                    source = ""
-                    date = ""
-                    is_pdf = False
-                    
-                    for line in lines:
-                        # 检查是否包含PDF标记
-                        if "PDF" in line:
-                            is_pdf = True
-                            # 移除PDF标记后的内容作为标题
-                            title = line.replace("PDF", "").strip()
-                        # 检查是否包含日期
-                        elif re.search(r'\[\d{4}-\d{2}-\d{2}\]', line):
-                            date = re.search(r'\[(\d{4}-\d{2}-\d{2})\]', line).group(1)
-                        # 其他内容可能是来源
-                        elif line and not title:
-                            title = line
-                        elif line:
-                            source += line + " "
-                    
-                    if title:  # 只添加有标题的结果
-                        paper_info = {
-                            "title": title,
-                            "source": source.strip(),
-                            "date": date,
-                            "is_pdf": is_pdf,
-                            "content": text_content  # 保存完整文本以备需要
-                        }
-                        parsed_results.append(paper_info)
-                        logger.info(f"解析到文献: {title[:50]}...")
-                        
-                except Exception as e:
-                    logger.error(f"解析单个结果时出错: {str(e)}")
-                    continue
+            for item in items:
+                paper = _parse_result_text(item.get("text") or "")
+                if paper:  # 只添加有标题的结果
+                    links = item.get("links") or []
+                    paper.is_pdf = paper.is_pdf or bool(item.get("isPdf"))
+                    paper.url = links[0] if links else ""
+                    parsed_results.append(paper)
+                    logger.info(f"解析到文献: {paper.title[:50]}...")
             
             logger.info(f"成功解析 {len(parsed_results)} 篇文献")
             return parsed_results, True
@@ -235,7 +386,7 @@ class LiteratureCrawler:
             logger.error(f"解析搜索结果时出错: {str(e)}")
             return [], True
             
-    def crawl_literature(self, topic: str, keywords: List[str], num_papers: int = 20) -> List[Dict]:
+    def crawl_literature(self, topic: str, keywords: List[str], num_papers: int = 20, save: bool = True) -> List[Paper]:
         """
         爬取相关文献
         
@@ -243,34 +394,31 @@ class LiteratureCrawler:
             topic: 文章主题
             keywords: 关键词列表
             num_papers: 需要爬取的文献数量
+            save: 是否同时将参考文献写入 references.txt
             
         Returns:
-            List[Dict]: 文献信息列表，每个字典包含标题、作者、摘要、发表年份等信息
+            List[Paper]: 文献列表
         """
         try:
-            # 设置浏览器驱动
+            # 获取浏览器池
             self._setup_driver()
             
-            # 构建更有针对性的搜索查询
-            # 使用主题和关键词，加上"参考文献"
-            search_query = f"{topic} AI 医疗 深度学习 参考文献"
-            logger.info(f"搜索查询: {search_query}")
-            
-            # 执行搜索
-            self._search_metaso(search_query)
+            # 将主题和关键词扩展为多个子查询并发执行
+            queries = self._plan_queries(topic, keywords)
+            logger.info(f"搜索计划: {queries}")
             
-            # 解析搜索结果
-            papers, _ = self._parse_search_results(self.driver)
+            # 需要登录时在主线程中提示，工作线程阻塞在标准输入上会让进程无法在超时后退出
+            fetch_count = self._needs_browser(queries)
+            if fetch_count:
+                self._login_pool(fetch_count)
+            papers = [paper for batch in self._run_queries(queries) for paper in batch]
             
-            # 对结果进行排序和去重
+            # 去重后按相关性取前 num_papers 篇
             papers = self._deduplicate_papers(papers)
-            papers = self._sort_papers_by_relevance(papers)
-            
-            # 获取指定数量的文献
-            papers = papers[:num_papers] if papers else []
+            papers = self._sort_papers_by_relevance(papers, topic, keywords, top_k=num_papers)
             
             # 保存参考文献
-            if papers:
+            if papers and save:
                 self.save_references(papers)
             
             return papers
@@ -279,25 +427,128 @@ class LiteratureCrawler:
             logger.error(f"爬取文献时出错: {str(e)}")
             return []
             
-        finally:
-            # 始终在完成后关闭浏览器
-            self._close_driver()
+    def _plan_queries(self, topic: str, keywords: List[str]) -> List[str]:
+        """
+        将主题和关键词扩展为多个子查询
+        
+        第一个查询只包含主题，其余查询按顺序将关键词分组后附加到主题上，
+        查询总数不超过 CRAWL_MAX_QUERIES。
+        
+        Args:
+            topic: 文章主题
+            keywords: 关键词列表，靠前的关键词优先
             
-    def _deduplicate_papers(self, papers: List[Dict]) -> List[Dict]:
-        """去除重复的文献"""
-        seen_titles = set()
-        unique_papers = []
+        Returns:
+            List[str]: 子查询列表
+        """
+        seen = {topic.strip().lower()}
+        terms = []
+        for keyword in keywords or []:
+            keyword = keyword.strip()
+            if keyword and keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                terms.append(keyword)
+                
+        queries = [f"{topic} 参考文献"]
+        size = max(1, self.config.CRAWL_KEYWORDS_PER_QUERY)
+        for start in range(0, len(terms), size):
+            if len(queries) >= self.config.CRAWL_MAX_QUERIES:
+                break
+            queries.append(f"{topic} {' '.join(terms[start:start + size])} 参考文献")
+        return queries
         
-        for paper in papers:
-            title = paper['title'].lower()
-            if title not in seen_titles:
-                seen_titles.add(title)
-                unique_papers.append(paper)
+    def _crawl_query(self, query: str) -> List[Paper]:
+        """执行单个查询，优先使用缓存结果，过期的结果先返回再在后台刷新"""
+        if self.crawl_cache is not None and not self.refresh_crawl:
+            papers, stale = self.crawl_cache.get(query)
+            if papers is not None:
+                logger.info(f"使用缓存的爬取结果{'（已过期，后台刷新）' if stale else ''}: {query}")
+                if stale:
+                    # 后台刷新不等待标准输入，未登录时放弃刷新并保留旧结果
+                    self.crawl_cache.revalidate(query, self._fetch_query)
+                return papers
                 
+        papers = self._fetch_query(query)
+        if papers and self.crawl_cache is not None:
+            self.crawl_cache.set(query, papers)
+        return papers
+        
+    def _fetch_query(self, query: str) -> List[Paper]:
+        """
+        使用浏览器池中的一个实例执行单个查询，出错时丢弃该实例
+        
+        在工作线程中运行，不提示用户登录；登录已在 crawl_literature 中于主线程完成，
+        未登录的实例直接报错。
+        """
+        logger.info(f"搜索查询: {query}")
+        try:
+            with self.pool.session(timeout=self.config.CRAWL_DEADLINE) as driver:
+                self._search_metaso(query, driver, interactive=False)
+                papers, _ = self._parse_search_results(driver)
+            return papers
+        except Exception as e:
+            logger.error(f"查询 {query} 出错: {str(e)}")
+            return []
+            
+    def _run_queries(self, queries: List[str]) -> List[List[Paper]]:
+        """
+        在浏览器池上并发执行查询，超过 CRAWL_DEADLINE 时只保留已完成的结果
+        
+        Args:
+            queries: 子查询列表
+            
+        Returns:
+            List[List[Paper]]: 按查询顺序排列的已完成查询结果
+        """
+        executor = ThreadPoolExecutor(max_workers=min(self.pool.size, len(queries)))
+        futures = [executor.submit(self._crawl_query, query) for query in queries]
+        done, pending = wait(futures, timeout=self.config.CRAWL_DEADLINE)
+        if pending:
+            logger.warning(f"超过 {self.config.CRAWL_DEADLINE} 秒的抓取时限，{len(pending)} 个查询未完成")
+            for future in pending:
+                future.cancel()
+        # 未完成的查询在后台结束后自行归还浏览器
+        executor.shutdown(wait=False)
+        return [future.result() for future in futures if future in done]
+            
+    def _deduplicate_papers(self, papers: List[Paper]) -> List[Paper]:
+        """去除重复和近似重复的文献（标题变体、同一文献的多个来源）"""
+        index_path = os.path.join(self.config.CACHE_DIR, DEDUP_INDEX_FILE) \
+            if self.config.CACHE_ENABLED and self.config.CACHE_DIR else None
+        index = load_index(
+            index_path,
+            num_perm=self.config.DEDUP_NUM_PERM,
+            bands=self.config.DEDUP_BANDS,
+            threshold=self.config.DEDUP_THRESHOLD,
+            max_entries=self.config.DEDUP_MAX_ENTRIES
+        )
+        unique_papers = index.deduplicate(papers)
+        logger.info(f"去重后剩余 {len(unique_papers)}/{len(papers)} 篇文献")
+        
+        if index_path:
+            try:
+                index.save(index_path)
+            except OSError as e:
+                logger.error(f"保存去重索引失败: {str(e)}")
         return unique_papers
         
-    def _sort_papers_by_relevance(self, papers: List[Dict]) -> List[Dict]:
-        """按相关性对文献进行排序"""
-        # 这里可以实现更复杂的排序逻辑
-        # 目前简单地按年份排序
-        return sorted(papers, key=lambda x: x.get('year', ''), reverse=True) 
\ No newline at end of file
+    def _sort_papers_by_relevance(self, papers: List[Paper], topic: str = "", keywords: Optional[List[str]] = None,
+                                  top_k: Optional[int] = None) -> List[Paper]:
+        """
+        按与主题和关键词的相关性对文献进行排序
+        
+        Args:
+            papers: 文献列表
+            topic: 文章主题
+            keywords: 关键词列表
+            top_k: 只保留得分最高的前 k 篇
+            
+        Returns:
+            List[Paper]: 排序后的文献列表
+        """
+        return rank_papers(
+            papers, topic, keywords,
+            recency_weight=self.config.RANK_RECENCY_WEIGHT,
+            half_life_years=self.config.RANK_HALF_LIFE_YEARS,
+            top_k=top_k
+        )
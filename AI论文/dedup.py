@@ -0,0 +1,231 @@
+"""
+文献去重模块 - 基于 MinHash LSH 的近似重复检测，索引可持久化以便跨运行复用
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+import unicodedata
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from paper import Paper
+
+logger = logging.getLogger(__name__)
+
+# 梅森素数 2^31-1，保证 a*x+b 在 uint64 内不溢出
+_PRIME = (1 << 31) - 1
+_SHINGLE_SIZE = 3
+_SOURCE_TOKENS = 3
+
+_STRIP_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """全角转半角、转小写并去除标点和空白"""
+    return _STRIP_RE.sub('', unicodedata.normalize('NFKC', title or '').lower())
+
+
+def paper_shingles(paper: Paper) -> List[str]:
+    """
+    计算文献的特征片段：标题的字符3-gram，加上来源的前几个词
+
+    Args:
+        paper: 文献记录，使用标题和来源
+
+    Returns:
+        List[str]: 去重后的特征片段
+    """
+    title = normalize_title(paper.title)
+    shingles = {title[i:i + _SHINGLE_SIZE] for i in range(max(1, len(title) - _SHINGLE_SIZE + 1))}
+    source = unicodedata.normalize('NFKC', paper.source or '').lower().split()
+    shingles.update(f"src:{token}" for token in source[:_SOURCE_TOKENS])
+    shingles.discard('')
+    return sorted(shingles)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH 索引，签名分段后分桶，只比较落入同一桶的候选文献"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.7, seed: int = 1,
+                 max_entries: int = 0):
+        """
+        初始化索引
+
+        Args:
+            num_perm: MinHash 签名长度
+            bands: LSH 分段数，每段 num_perm // bands 行
+            threshold: 估计的 Jaccard 相似度达到该值时视为重复
+            seed: 生成哈希参数的随机种子，持久化的索引必须使用相同的种子
+            max_entries: 保存时保留的最多文献数，超出时淘汰最早加入的，0 表示不限制
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm 必须是 bands 的整数倍")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed
+        self.max_entries = max_entries
+        rng = random.Random(seed)
+        self._a = np.array([rng.randrange(1, _PRIME) for _ in range(num_perm)], dtype=np.uint64)
+        self._b = np.array([rng.randrange(0, _PRIME) for _ in range(num_perm)], dtype=np.uint64)
+        self._ids: List[str] = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._positions: Dict[str, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        """计算 MinHash 签名，片段哈希使用 crc32 以保证跨进程稳定"""
+        values = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % _PRIME for shingle in shingles), dtype=np.uint64
+        )
+        if not values.size:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint32)
+        hashed = (self._a[:, None] * values[None, :] + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, paper_id: str, signature: np.ndarray):
+        position = len(self._ids)
+        if position == len(self._signatures):
+            # 按倍数扩容，避免每次插入都复制整个签名矩阵
+            grown = np.empty((max(64, position * 2), self.num_perm), dtype=np.uint32)
+            grown[:position] = self._signatures[:position]
+            self._signatures = grown
+        self._ids.append(paper_id)
+        self._signatures[position] = signature
+        self._positions[paper_id] = position
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+
+    def query(self, signature: np.ndarray) -> Optional[str]:
+        """
+        查找与签名近似重复的已有文献
+
+        Args:
+            signature: MinHash 签名
+
+        Returns:
+            Optional[str]: 相似度最高的重复文献ID，没有时返回 None
+        """
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return None
+        positions = np.fromiter(candidates, dtype=np.intp)
+        scores = (self._signatures[positions] == signature).mean(axis=1)
+        best = int(scores.argmax())
+        return self._ids[positions[best]] if scores[best] >= self.threshold else None
+
+    def canonical_id(self, paper: Paper) -> str:
+        """
+        返回文献所属重复组的ID，未见过的文献以其规范化标题的哈希作为新ID加入索引
+
+        Args:
+            paper: 文献记录
+
+        Returns:
+            str: 重复组ID
+        """
+        paper_id = hashlib.blake2b(
+            normalize_title(paper.title).encode('utf-8'), digest_size=8
+        ).hexdigest()
+        if paper_id in self._positions:
+            return paper_id
+        signature = self.signature(paper_shingles(paper))
+        duplicate = self.query(signature)
+        if duplicate is not None:
+            return duplicate
+        self._insert(paper_id, signature)
+        return paper_id
+
+    def deduplicate(self, papers: List[Paper]) -> List[Paper]:
+        """
+        去除近似重复的文献，每组保留最先出现的一篇
+
+        Args:
+            papers: 文献列表
+
+        Returns:
+            List[Paper]: 去重后的文献列表
+        """
+        seen = set()
+        unique_papers = []
+        for paper in papers:
+            paper_id = self.canonical_id(paper)
+            if paper_id not in seen:
+                seen.add(paper_id)
+                unique_papers.append(paper)
+        return unique_papers
+
+    def save(self, path: str):
+        """
+        将索引写入 .npz 文件，先写临时文件再替换，避免并发运行读到半个文件
+
+        设置了 max_entries 时只写入最近加入的文献，较早的条目在下次加载时不再出现。
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        start = max(0, len(self._ids) - self.max_entries) if self.max_entries > 0 else 0
+        if start:
+            logger.info(f"去重索引超过 {self.max_entries} 篇，淘汰最早加入的 {start} 篇")
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                ids=np.array(self._ids[start:], dtype=str),
+                signatures=self._signatures[start:len(self._ids)],
+                params=np.array([self.num_perm, self.bands, self.seed]),
+                threshold=np.array(self.threshold)
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'NearDuplicateIndex':
+        """从 .npz 文件加载索引"""
+        with np.load(path) as data:
+            num_perm, bands, seed = (int(value) for value in data['params'])
+            index = cls(num_perm=num_perm, bands=bands, threshold=float(data['threshold']), seed=seed)
+            for paper_id, signature in zip(data['ids'], data['signatures']):
+                index._insert(str(paper_id), signature)
+        return index
+
+
+def load_index(path: Optional[str], num_perm: int = 64, bands: int = 16,
+               threshold: float = 0.7, max_entries: int = 0) -> NearDuplicateIndex:
+    """
+    加载持久化的索引，文件不存在、损坏或参数不一致时新建
+
+    Args:
+        path: 索引文件路径，None 表示不持久化
+        num_perm: MinHash 签名长度
+        bands: LSH 分段数
+        threshold: 重复判定阈值
+        max_entries: 保存时保留的最多文献数，0 表示不限制
+
+    Returns:
+        NearDuplicateIndex: 索引
+    """
+    if path and os.path.exists(path):
+        try:
+            index = NearDuplicateIndex.load(path)
+            if index.num_perm == num_perm and index.bands == bands:
+                index.threshold = threshold
+                index.max_entries = max_entries
+                return index
+            logger.info("去重索引参数已变化，重新建立索引")
+        except Exception as e:
+            logger.error(f"加载去重索引失败: {str(e)}")
+    return NearDuplicateIndex(num_perm=num_perm, bands=bands, threshold=threshold, max_entries=max_entries)
@@ -0,0 +1,212 @@
+"""
+浏览器驱动管理模块 - 缓存 msedgedriver 的解析结果并共享长期运行的驱动服务
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Dict, Optional
+
+from selenium.webdriver.edge.service import Service as EdgeService  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+DRIVER_CACHE_FILE = "edge_driver.json"
+
+_VERSION_RE = re.compile(r'\d+(?:\.\d+)+')
+
+# 各平台 Edge 浏览器的常见可执行文件，用于读取浏览器版本
+_EDGE_BINARIES = (
+    'microsoft-edge',
+    'microsoft-edge-stable',
+    '/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge',
+)
+
+
+def driver_version(path: str) -> Optional[str]:
+    """
+    通过 --version 获取驱动版本
+
+    Args:
+        path: 驱动可执行文件路径
+
+    Returns:
+        Optional[str]: 版本号，驱动不存在或无法运行时返回 None
+    """
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_RE.search(result.stdout)
+    return match.group(0) if result.returncode == 0 and match else None
+
+
+def browser_version() -> Optional[str]:
+    """
+    获取本机 Edge 浏览器的版本，Windows 读取注册表，其他平台运行 --version
+
+    Returns:
+        Optional[str]: 版本号，未安装或无法识别时返回 None
+    """
+    if sys.platform == 'win32':
+        import winreg
+        for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(root, r'Software\Microsoft\Edge\BLBeacon') as key:
+                    return winreg.QueryValueEx(key, 'version')[0]
+            except OSError:
+                continue
+        return None
+    for binary in _EDGE_BINARIES:
+        path = shutil.which(binary) or (binary if os.path.isfile(binary) else None)
+        if not path:
+            continue
+        try:
+            result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _VERSION_RE.search(result.stdout)
+        if result.returncode == 0 and match:
+            return match.group(0)
+    return None
+
+
+def _matches_browser(version: str, browser: Optional[str]) -> bool:
+    """驱动与浏览器的主版本号一致时可用，浏览器版本未知时不做判断"""
+    return browser is None or version.split('.')[0] == browser.split('.')[0]
+
+
+def _load_cache(cache_file: str) -> Dict[str, str]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_file: str, path: str, version: str):
+    directory = os.path.dirname(cache_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump({"path": path, "version": version}, f, ensure_ascii=False, indent=4)
+
+
+def _install_driver() -> str:
+    """联网查询并下载与本机 Edge 匹配的驱动"""
+    from webdriver_manager.microsoft import EdgeChromiumDriverManager  # type: ignore
+    return EdgeChromiumDriverManager().install()
+
+
+def resolve_edge_driver(config, refresh: bool = False) -> str:
+    """
+    解析 msedgedriver 路径，依次使用固定路径、本地缓存、PATH
+
+    只有 refresh 为True或设置了 EDGE_DRIVER_AUTO_DOWNLOAD 时才联网下载，否则找不到
+    可用驱动时直接报错。缓存和 PATH 中的驱动须与本机 Edge 的主版本号一致；
+    无法读取浏览器版本时（如非常规安装路径）不做这项检查。
+
+    Args:
+        config: 配置对象，读取 EDGE_DRIVER_PATH、EDGE_DRIVER_AUTO_DOWNLOAD、CACHE_DIR
+        refresh: 为True时忽略缓存，联网重新解析驱动
+
+    Returns:
+        str: 驱动可执行文件路径
+    """
+    if config.EDGE_DRIVER_PATH:
+        version = driver_version(config.EDGE_DRIVER_PATH)
+        if not version:
+            raise RuntimeError(f"EDGE_DRIVER_PATH 指定的驱动不可用: {config.EDGE_DRIVER_PATH}")
+        logger.info(f"使用固定路径的 Edge 驱动: {config.EDGE_DRIVER_PATH} ({version})")
+        return config.EDGE_DRIVER_PATH
+
+    cache_file = os.path.join(config.CACHE_DIR, DRIVER_CACHE_FILE)
+    if not refresh:
+        browser = browser_version()
+        cached = _load_cache(cache_file)
+        path = cached.get("path", "")
+        if path and driver_version(path) == cached.get("version"):
+            if _matches_browser(cached["version"], browser):
+                logger.info(f"使用缓存的 Edge 驱动: {path} ({cached['version']})")
+                return path
+            logger.warning(f"缓存的 Edge 驱动 {cached['version']} 与浏览器 {browser} 版本不一致")
+
+        path = shutil.which("msedgedriver") or ""
+        version = driver_version(path)
+        if version:
+            if _matches_browser(version, browser):
+                _save_cache(cache_file, path, version)
+                logger.info(f"使用 PATH 中的 Edge 驱动: {path} ({version})")
+                return path
+            logger.warning(f"PATH 中的 Edge 驱动 {version} 与浏览器 {browser} 版本不一致")
+
+        if not config.EDGE_DRIVER_AUTO_DOWNLOAD:
+            raise RuntimeError(
+                "未找到与本机 Edge 匹配的驱动，请设置 EDGE_DRIVER_PATH、将 msedgedriver 加入 PATH，"
+                "或使用 --refresh-driver（或设置 EDGE_DRIVER_AUTO_DOWNLOAD）联网下载"
+            )
+
+    logger.info("正在联网解析 Edge 驱动...")
+    path = _install_driver()
+    version = driver_version(path)
+    if not version:
+        raise RuntimeError(f"下载的 Edge 驱动无法运行: {path}")
+    _save_cache(cache_file, path, version)
+    logger.info(f"Edge 驱动已缓存: {path} ({version})")
+    return path
+
+
+_service: Optional[EdgeService] = None
+_service_lock = threading.Lock()
+
+
+def get_edge_service(config, refresh: bool = False) -> EdgeService:
+    """
+    获取进程内共享的驱动服务，首次调用时启动，进程退出时停止
+
+    多个浏览器会话通过 service.service_url 连接同一个驱动服务，
+    避免每次创建浏览器都重新解析和启动驱动。
+
+    Args:
+        config: 配置对象
+        refresh: 为True时重新解析驱动并重启服务
+
+    Returns:
+        EdgeService: 已启动的驱动服务
+    """
+    global _service
+    with _service_lock:
+        if _service is not None and not refresh and _service.is_connectable():
+            return _service
+        if _service is not None:
+            _stop_service(_service)
+
+        service = EdgeService(resolve_edge_driver(config, refresh=refresh))
+        service.start()
+        _service = service
+        logger.info(f"Edge 驱动服务已启动: {service.service_url}")
+        return service
+
+
+def _stop_service(service: EdgeService):
+    try:
+        service.stop()
+    except Exception as e:
+        logger.error(f"停止 Edge 驱动服务失败: {str(e)}")
+
+
+def _stop_shared_service():
+    if _service is not None:
+        _stop_service(_service)
+
+
+# 在导入时注册，保证退出时晚于浏览器池关闭，浏览器会话仍能正常退出
+atexit.register(_stop_shared_service)
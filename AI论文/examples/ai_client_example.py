@@ -4,7 +4,7 @@ AI连接器使用示例
 
 import asyncio
 import logging
-from src.config import Config
+from config import Config
 from src.ai_client.ai_connector import AIConnector
 
 async def main():
@@ -36,8 +36,11 @@ async def main():
         ]
         print("\n\n批量处理文本:")
         try:
-            async for response in ai_client.batch_process(texts):
-                print(response, end='')
+            async for item in ai_client.batch_process(texts):
+                if 'error' in item:
+                    print(f"[{item['index']}] 出错: {item['error']}")
+                else:
+                    print(f"[{item['index']}] {item['result']}")
         except Exception as e:
             print(f"批量处理时出错: {e}")
 
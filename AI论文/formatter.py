@@ -0,0 +1,229 @@
+"""
+论文格式化模块 - 预编译的中英文论文格式化规则
+
+固定规则表在导入时编译一次。删除按原有顺序分三步：AI生成特征逐条删除
+（前一条的删除可能形成后一条的匹配，逐条处理保证结果与原实现一致），
+然后删除机械化过渡词，最后删除多余标记。机械化过渡词来自
+Config.MECHANICAL_PHRASES（开启 REMOVE_EXTRA_MECHANICAL_PHRASES 时加上
+EXTRA_MECHANICAL_PHRASES），编译为按前缀树组织的正则，一次扫描匹配所有短语。
+与原实现按词表顺序逐个替换不同，删除一个过渡词后才拼接出的过渡词不会再被删除
+（原实现是否删除取决于两者在词表中的先后）。规则按配置内容缓存并在处理器之间共享。
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+from config import Config
+from phrase_matcher import compile_phrases
+
+# ---------------------------------------------------------------- 英文规则
+
+# AI生成特征
+_EN_AI_PATTERNS = [
+    r'As an AI .*?,',
+    r'I apologize,.*?\.',
+    r'I cannot.*?\.',
+    r'I do not have.*?\.',
+    r'I\'m sorry,.*?\.',
+    r'I am not able to.*?\.',
+    r'I must inform you.*?\.',
+    r'Please note that.*?\.',
+    r'It\'s important to note.*?\.',
+    r'I would recommend.*?\.',
+    r'I suggest.*?\.',
+    r'In my opinion.*?\.',
+    r'Based on my understanding.*?\.',
+    r'From my perspective.*?\.',
+    r'As far as I know.*?\.',
+    r'To the best of my knowledge.*?\.'
+]
+
+EN_SECTIONS = ['Title', 'Abstract', 'Introduction', 'Methods', 'Results', 'Discussion', 'Conclusion', 'References']
+
+_EN_MARKUP_RE = re.compile(r'\*\*|\#\#|__')
+_EN_PARAGRAPH_RE = re.compile(r'([.!?])\s+([A-Z])')
+_EN_SECTION_RE = re.compile('(' + '|'.join(f'{s}:?' for s in EN_SECTIONS) + ')')
+_EN_SECTION_SEARCH_RE = re.compile('|'.join(EN_SECTIONS))
+_EN_YEAR_CITATION_RE = re.compile(r'\((\d{4})\)')
+_EN_ET_AL_RE = re.compile(r'et\s+al\.')
+_EN_TITLE_RE = re.compile(r'^Title\s*\n\s*(.+?)(?=\n\n)')
+_EN_AI_RES = tuple(re.compile(p, re.IGNORECASE) for p in _EN_AI_PATTERNS)
+
+# ---------------------------------------------------------------- 中文规则
+
+_CN_AI_PATTERNS = [
+    r'作为人工智能.*?，',
+    r'我认为.*?。',
+    r'我的理解是.*?。',
+    r'我不能.*?。',
+    r'我必须说明.*?。',
+    r'请注意.*?。',
+    r'需要说明的是.*?。',
+    r'我建议.*?。',
+    r'我的观点是.*?。',
+    r'据我所知.*?。',
+    r'本文.*?。',
+    r'我们.*?。'
+]
+
+CN_SECTIONS = ['标题', '摘要', '引言', '研究方法', '研究结果', '讨论', '结论', '参考文献']
+
+_CN_AI_RES = tuple(re.compile(p) for p in _CN_AI_PATTERNS)
+_CN_MARKUP_RE = re.compile(r'\*\*|\#|__')
+_CN_PARAGRAPH_RE = re.compile(r'([。！？])\s*([^，。！？、])')
+_CN_SECTION_RE = re.compile('(' + '|'.join(CN_SECTIONS) + ')')
+_CN_SECTION_SEARCH_RE = _CN_SECTION_RE
+_CN_YEAR_CITATION_RE = re.compile(r'（(\d{4})）')
+_CN_ETC_RE = re.compile(r'等人?')
+_CN_TITLE_RE = re.compile(r'^标题\s*\n\s*(.+?)(?=\n\n)')
+_CN_INVALID_CHAR_RE = re.compile(r'[^\u4e00-\u9fa5a-zA-Z0-9，。！？、：；""（）【】《》\[\]\s\.]')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class FormatRules:
+    """由配置生成的格式化规则"""
+    en_ai_res: Tuple[re.Pattern, ...]
+    en_phrases_re: re.Pattern
+    cn_phrases_re: re.Pattern
+
+
+@lru_cache(maxsize=16)
+def _build_format_rules(phrases: Tuple[str, ...], patterns: Tuple[str, ...]) -> FormatRules:
+    """编译格式化规则，相同配置只编译一次"""
+    # AI特征不区分大小写：内置模式之后是 Config.PATTERNS 开头的整句
+    en_ai_res = _EN_AI_RES + tuple(re.compile(rf'(?:{p}).*?\.', re.IGNORECASE) for p in patterns)
+
+    # 英文过渡词需位于词首并后接逗号和空白，中文过渡词需后接全角逗号
+    en_phrases = tuple(p for p in phrases if p.isascii())
+    cn_phrases = tuple(p for p in phrases if not p.isascii())
+    return FormatRules(
+        en_ai_res=en_ai_res,
+        en_phrases_re=compile_phrases(en_phrases, prefix=r'(?<!\w)', suffix=r',\s+'),
+        cn_phrases_re=compile_phrases(cn_phrases, suffix='，')
+    )
+
+
+def get_format_rules(config: Optional[Config] = None) -> FormatRules:
+    """
+    获取与配置对应的格式化规则
+
+    Args:
+        config: 配置对象，默认使用 Config()
+
+    Returns:
+        FormatRules: 共享的规则对象
+    """
+    config = config or _default_config()
+    phrases = tuple(config.MECHANICAL_PHRASES)
+    if config.REMOVE_EXTRA_MECHANICAL_PHRASES:
+        phrases += tuple(config.EXTRA_MECHANICAL_PHRASES)
+    return _build_format_rules(phrases, tuple(config.PATTERNS))
+
+
+@lru_cache(maxsize=1)
+def _default_config() -> Config:
+    return Config()
+
+
+def _remove_each(text: str, patterns: Iterable[re.Pattern]) -> str:
+    """按顺序逐条删除匹配"""
+    for pattern in patterns:
+        text = pattern.sub('', text)
+    return text
+
+
+def _indent_paragraphs(text: str, section_re: re.Pattern) -> str:
+    """章节标题行顶格，其余非空行缩进四个空格"""
+    formatted_lines = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            formatted_lines.append('')
+        elif section_re.search(line):
+            formatted_lines.append(stripped)
+        else:
+            formatted_lines.append('    ' + stripped)
+    return '\n'.join(formatted_lines)
+
+
+def format_english_paper(text: str, rules: Optional[FormatRules] = None) -> str:
+    """
+    格式化英文论文
+
+    Args:
+        text: 模型生成的英文论文
+        rules: 格式化规则，默认由 Config() 生成
+
+    Returns:
+        str: 格式化后的论文
+    """
+    rules = rules or get_format_rules()
+
+    # 1. 依次移除AI生成特征、机械化过渡词和多余标记
+    text = _remove_each(text, rules.en_ai_res)
+    text = rules.en_phrases_re.sub('', text)
+    text = _EN_MARKUP_RE.sub('', text)
+
+    # 2. 格式化段落和空白
+    text = _WHITESPACE_RE.sub(' ', text)
+    text = _EN_PARAGRAPH_RE.sub(r'\1\n\n\2', text)
+
+    # 3. 处理章节标题格式
+    text = _EN_SECTION_RE.sub(r'\n\n\1\n', text)
+
+    # 4. 规范化引用格式
+    text = _EN_YEAR_CITATION_RE.sub(r' [\1]', text)  # 将(2023)改为[2023]
+    text = _EN_ET_AL_RE.sub('et al.', text)
+
+    # 5. 确保段落缩进
+    text = _indent_paragraphs(text, _EN_SECTION_SEARCH_RE)
+
+    # 6. 规范化标题格式
+    text = _EN_TITLE_RE.sub(lambda m: f'Title\n{m.group(1).upper()}', text)
+
+    return text.strip()
+
+
+def format_chinese_paper(text: str, rules: Optional[FormatRules] = None) -> str:
+    """
+    格式化中文论文
+
+    Args:
+        text: 模型生成的中文论文
+        rules: 格式化规则，默认由 Config() 生成
+
+    Returns:
+        str: 格式化后的论文
+    """
+    rules = rules or get_format_rules()
+
+    # 1. 依次移除AI生成特征、机械化过渡词和多余标记
+    text = _remove_each(text, _CN_AI_RES)
+    text = rules.cn_phrases_re.sub('', text)
+    text = _CN_MARKUP_RE.sub('', text)
+
+    # 2. 格式化段落和空白
+    text = _WHITESPACE_RE.sub(' ', text)
+    text = _CN_PARAGRAPH_RE.sub(r'\1\n\n\2', text)
+
+    # 3. 处理章节标题格式
+    text = _CN_SECTION_RE.sub(r'\n\n\1\n', text)
+
+    # 4. 规范化引用格式
+    text = _CN_YEAR_CITATION_RE.sub(r'[\1]', text)  # 将（2023）改为[2023]
+    text = _CN_ETC_RE.sub('', text)  # 移除"等人"和"等"
+
+    # 5. 确保段落缩进
+    text = _indent_paragraphs(text, _CN_SECTION_SEARCH_RE)
+
+    # 6. 规范化标题格式
+    text = _CN_TITLE_RE.sub(lambda m: f'标题\n{m.group(1)}', text)
+
+    # 7. 移除特殊字符
+    text = _CN_INVALID_CHAR_RE.sub('', text)
+
+    return text.strip()
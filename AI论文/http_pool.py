@@ -0,0 +1,194 @@
+"""
+HTTP连接池模块 - 为 /v1/chat/completions 提供线程安全的长连接复用
+"""
+
+import http.client
+import logging
+import queue
+import select
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# AI服务地址
+API_HOST = "gpt-5.vip"
+API_BASE_URL = f"https://{API_HOST}"
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+# 空闲连接的保活时间（秒），超过后在取用时重建
+KEEPALIVE_TIMEOUT = 60
+
+# 连接被服务端关闭时可以安全重发的异常
+_RECONNECT_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPConnectionPool:
+    """线程安全的HTTPS连接池，支持保活、健康检查和断线重连"""
+
+    def __init__(self, host: str = API_HOST, size: int = 16, timeout: Optional[float] = None,
+                 keepalive_timeout: float = KEEPALIVE_TIMEOUT, read_timeout: Optional[float] = None):
+        """
+        初始化连接池
+
+        Args:
+            host: 服务器地址
+            size: 最大并发连接数
+            timeout: 建立连接的超时时间（秒）
+            keepalive_timeout: 空闲连接的最长保活时间（秒）
+            read_timeout: 发出请求后读取响应的超时时间（秒），None 表示不限，
+                流式响应在两段数据之间可能停顿较久，应长于 timeout
+        """
+        if size < 1:
+            raise ValueError("连接池大小必须大于0")
+        self.host = host
+        self.size = size
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self.read_timeout = read_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._closed = False
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """创建新连接（首次请求时才真正建立TCP/TLS连接）"""
+        return http.client.HTTPSConnection(self.host, timeout=self.timeout)
+
+    def _is_healthy(self, conn: http.client.HTTPConnection, last_used: float) -> bool:
+        """检查空闲连接是否仍可复用"""
+        if conn.sock is None:
+            # 尚未连接或已关闭，下次请求时会自动重连
+            return True
+        if time.monotonic() - last_used > self.keepalive_timeout:
+            return False
+        try:
+            # 空闲连接上出现可读事件，说明服务端已关闭或残留了数据
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+            return not readable
+        except (OSError, ValueError):
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> http.client.HTTPConnection:
+        """
+        从池中取出一个连接
+
+        Args:
+            timeout: 等待空闲连接的最长时间（秒），None 表示一直等待
+
+        Returns:
+            http.client.HTTPConnection: 可用连接
+        """
+        if self._closed:
+            raise RuntimeError("连接池已关闭")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("等待可用连接超时")
+
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._new_connection()
+            if self._is_healthy(conn, last_used):
+                return conn
+            logger.debug(f"丢弃失效连接: {self.host}")
+            conn.close()
+
+    def release(self, conn: http.client.HTTPConnection, discard: bool = False):
+        """
+        归还连接
+
+        Args:
+            conn: 之前取出的连接
+            discard: 为True时关闭连接而不放回池中
+        """
+        try:
+            if discard or self._closed:
+                conn.close()
+            else:
+                self._idle.put((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[http.client.HTTPConnection]:
+        """以上下文管理器的方式使用连接，出错时自动丢弃"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        else:
+            self.release(conn)
+
+    def send(self, conn: http.client.HTTPConnection, method: str, url: str,
+             body: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> http.client.HTTPResponse:
+        """
+        在指定连接上发送请求，连接被服务端断开时自动重连并重发一次
+
+        Args:
+            conn: 由 acquire/connection 取得的连接
+            method: 请求方法
+            url: 请求路径
+            body: 请求体
+            headers: 请求头
+
+        Returns:
+            http.client.HTTPResponse: 响应对象
+        """
+        for attempt in range(2):
+            try:
+                conn.request(method, url, body, headers or {})
+                # 连接已按 timeout 建立，读取响应改用单独的读超时
+                if conn.sock is not None:
+                    conn.sock.settimeout(self.read_timeout)
+                return conn.getresponse()
+            except _RECONNECT_ERRORS as e:
+                conn.close()
+                if attempt:
+                    raise
+                logger.warning(f"连接已断开，正在重连: {str(e)}")
+
+    def close(self):
+        """关闭所有空闲连接"""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+_pools: Dict[str, HTTPConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(host: str = API_HOST, size: int = 16, timeout: Optional[float] = None,
+             read_timeout: Optional[float] = None) -> HTTPConnectionPool:
+    """
+    获取进程内共享的连接池，同一主机只创建一次
+
+    Args:
+        host: 服务器地址
+        size: 首次创建时的连接池大小
+        timeout: 首次创建时的连接超时时间（秒）
+        read_timeout: 首次创建时的响应读取超时时间（秒），None 表示不限
+
+    Returns:
+        HTTPConnectionPool: 共享连接池
+    """
+    with _pools_lock:
+        pool = _pools.get(host)
+        if pool is None or pool._closed:
+            pool = HTTPConnectionPool(host, size=size, timeout=timeout, read_timeout=read_timeout)
+            _pools[host] = pool
+        return pool
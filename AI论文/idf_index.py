@@ -0,0 +1,252 @@
+"""
+IDF索引模块 - 由自有语料统计的中英文文档频率，紧凑存储并支持增量更新
+
+索引目录结构：
+    vocab.txt  每行一个词，行号即词ID
+    df.bin     按词ID排列的 uint32（小端）文档频率数组
+    meta.json  文档总数和词数
+    .lock      跨进程更新时加锁的文件
+
+更新时在文件锁内重新读取索引，各文件写入临时文件后替换，读取方不会看到写了一半的文件。
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VOCAB_FILE = "vocab.txt"
+DF_FILE = "df.bin"
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+
+# 文档频率的存储类型：小端 uint32；numpy 在首次读写索引时才导入
+_DF_DTYPE = '<u4'
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """跨进程的排他文件锁，阻塞直到获得锁"""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    # LK_LOCK 重试约10秒后仍未获得锁时抛出 OSError，继续等待
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _write_atomic(path: str, data: bytes):
+    """先写临时文件再替换，读取方只会看到完整的旧文件或新文件"""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class IDFIndex:
+    """持久化的文档频率索引，首次查询时才加载，可由多个进程同时更新"""
+
+    def __init__(self, path: str):
+        """
+        初始化索引
+
+        Args:
+            path: 索引目录
+        """
+        self.path = path
+        self.documents = 0
+        self._vocab: Dict[str, int] = {}
+        self._df = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def exists(self) -> bool:
+        """索引目录中是否已有数据"""
+        return os.path.exists(self._file(META_FILE))
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.exists():
+                return
+
+            with open(self._file(META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(self._file(VOCAB_FILE), 'r', encoding='utf-8') as f:
+                terms = f.read().split('\n')[:meta["terms"]]
+
+            import numpy as np
+
+            # 以 meta.json 为准，忽略其他进程更新时已写入、尚未计入 meta.json 的词。
+            # df.bin 整体读入内存而不做内存映射：每个词只占4字节，且 Windows 上被映射的文件无法被替换
+            df = np.fromfile(self._file(DF_FILE), dtype=_DF_DTYPE, count=len(terms))
+            count = min(len(terms), len(df))
+            self.documents = meta["documents"]
+            self._vocab = {term: i for i, term in enumerate(terms[:count])}
+            self._df = df[:count]
+
+    def _release(self):
+        """丢弃已加载的数据，下次查询时重新读取"""
+        self._df = None
+        self._vocab = {}
+        self._loaded = False
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._vocab)
+
+    def __contains__(self, term: str) -> bool:
+        self._load()
+        return term in self._vocab
+
+    @property
+    def document_count(self) -> int:
+        """索引中的文档总数"""
+        self._load()
+        return self.documents
+
+    def document_frequency(self, terms: Sequence[str]) -> 'np.ndarray':
+        """
+        查询一组词的文档频率
+
+        Args:
+            terms: 词列表
+
+        Returns:
+            np.ndarray: 每个词的文档频率，未收录的词为 0
+        """
+        import numpy as np
+
+        self._load()
+        ids = np.fromiter((self._vocab.get(term, -1) for term in terms), dtype=np.int64, count=len(terms))
+        df = np.zeros(len(terms))
+        known = ids >= 0
+        if known.any():
+            df[known] = self._df[ids[known]]
+        return df
+
+    def idf(self, terms: Sequence[str]) -> 'np.ndarray':
+        """
+        计算一组词的平滑IDF：log((N + 1) / (df + 1)) + 1，未收录的词按 df=0 计
+
+        Args:
+            terms: 词列表
+
+        Returns:
+            np.ndarray: 每个词的IDF
+        """
+        import numpy as np
+
+        df = self.document_frequency(terms)
+        return np.log((self.documents + 1) / (df + 1)) + 1
+
+    def add_documents(self, documents: Iterable[Iterable[str]]) -> int:
+        """
+        增量加入文档：已有词的文档频率累加，新词追加到词表末尾
+
+        在文件锁内重新读取磁盘上的索引后合并，其他进程同时写入的文档不会丢失。
+
+        Args:
+            documents: 每篇文档的词序列
+
+        Returns:
+            int: 加入的文档数
+        """
+        counts = Counter()
+        added = 0
+        for terms in documents:
+            counts.update({term for term in terms if term and not term.isspace() and '\n' not in term})
+            added += 1
+        if not added:
+            return 0
+
+        import numpy as np
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock, _file_lock(self._file(LOCK_FILE)):
+            # 其他进程可能已更新索引，加锁后重新读取
+            self._release()
+            self._load()
+            vocab = self._vocab
+            terms: List[str] = list(vocab)
+            df = self._df if self._df is not None else np.zeros(0, dtype=_DF_DTYPE)
+            total_documents = self.documents + added
+            self._release()
+
+            existing = [(vocab[term], count) for term, count in counts.items() if term in vocab]
+            new_terms = [term for term in counts if term not in vocab]
+            if existing:
+                ids, increments = zip(*existing)
+                np.add.at(df, np.array(ids), np.array(increments, dtype=_DF_DTYPE))
+            df = np.concatenate((df, np.array([counts[term] for term in new_terms], dtype=_DF_DTYPE)))
+            terms.extend(new_terms)
+
+            # 先写词表和文档频率，最后写 meta.json；中途中断时按旧的 meta.json 读取，多出的词被忽略
+            _write_atomic(self._file(VOCAB_FILE), ''.join(f"{term}\n" for term in terms).encode('utf-8'))
+            _write_atomic(self._file(DF_FILE), df.astype(_DF_DTYPE).tobytes())
+            _write_atomic(
+                self._file(META_FILE),
+                json.dumps({"documents": total_documents, "terms": len(terms)}).encode('utf-8')
+            )
+
+        logger.info(f"IDF索引已更新: {total_documents} 篇文档, {len(terms)} 个词")
+        return added
+
+    def close(self):
+        with self._lock:
+            self._release()
+
+
+_indexes: Dict[str, IDFIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_idf_index(path: Optional[str], create: bool = False) -> Optional[IDFIndex]:
+    """
+    获取进程内共享的IDF索引
+
+    Args:
+        path: 索引目录
+        create: 为False时，索引目录中还没有数据则返回 None；为True时总是返回，用于首次写入
+
+    Returns:
+        Optional[IDFIndex]: 索引
+    """
+    if not path:
+        return None
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = IDFIndex(path)
+            _indexes[path] = index
+    return index if create or index.exists() else None
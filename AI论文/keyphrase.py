@@ -0,0 +1,131 @@
+"""
+英文关键短语模块 - RAKE 风格的共现打分（NumPy 向量化），不依赖词性标注模型
+"""
+
+import re
+from collections import Counter
+from typing import FrozenSet, List, Tuple
+
+# 停用词和标点把文本切分为候选短语；末尾几行是论文摘要中常见的动词
+ENGLISH_STOPWORDS: FrozenSet[str] = frozenset("""
+a about above across after again against all almost also although always am among an and another any
+are around as at be because been before being below between both but by can cannot could did do does
+doing done down during each either else enough etc even ever every few for from further get gets given
+had has have having he her here hers herself him himself his how however i if in into is it its itself
+just least less let like made make makes many may me might more most much must my myself neither no nor
+not now of off often on once one only onto or other others otherwise our ours ourselves out over own per
+rather same several shall she should show shown shows since so some such than that the their theirs
+them themselves then there therefore these they this those though through thus to together too toward
+towards under until up upon us use used uses using very via was we well were what whether when where
+which while who whom whose why will with within without would yet you your yours yourself yourselves
+achieve achieved achieves allow allows compare compared consider considered demonstrate demonstrated
+demonstrates enable enables evaluate evaluated improve improved improves introduce introduced introduces
+obtain obtained present presented presents propose proposed proposes provide provides
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z]+(?:[-'][a-z]+)*|[^a-z\s]+")
+
+
+class RakeExtractor:
+    """RAKE 关键短语提取器：词得分为 度/频次，短语得分为词得分之和乘以短语出现次数"""
+
+    def __init__(self, stopwords: FrozenSet[str] = ENGLISH_STOPWORDS, max_words: int = 3,
+                 min_chars: int = 2):
+        """
+        初始化提取器
+
+        Args:
+            stopwords: 停用词集合，作为短语分隔符
+            max_words: 参与排序的短语最大词数，更长的片段只用于计算词得分；
+                所有片段都超长时，从中取该长度的窗口参与排序
+            min_chars: 单词的最少字符数，更短的词作为分隔符
+        """
+        self.stopwords = frozenset(stopwords)
+        self.max_words = max_words
+        self.min_chars = min_chars
+
+    def candidates(self, text: str) -> List[Tuple[str, ...]]:
+        """
+        按停用词、短词和标点切分出候选短语
+
+        Args:
+            text: 英文文本
+
+        Returns:
+            List[Tuple[str, ...]]: 按出现顺序排列的候选短语（小写单词元组），可重复，不限长度
+        """
+        stopwords = self.stopwords
+        min_chars = self.min_chars
+        phrases = []
+        current = []
+        for token in _TOKEN_RE.findall(text.lower()):
+            if token in stopwords or len(token) < min_chars or not token[0].isalpha():
+                if current:
+                    phrases.append(tuple(current))
+                current = []
+            else:
+                current.append(token)
+        if current:
+            phrases.append(tuple(current))
+        return phrases
+
+    def rank(self, candidates: List[Tuple[str, ...]], top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        为候选短语打分并排序
+
+        Args:
+            candidates: candidates 的结果
+            top_k: 返回的短语数
+
+        Returns:
+            List[Tuple[str, float]]: 得分降序的 (短语, 得分)
+        """
+        if not candidates:
+            return []
+        # numpy 导入较慢，只在实际打分时导入
+        import numpy as np
+
+        vocab = {}
+        ids = np.fromiter(
+            (vocab.setdefault(word, len(vocab)) for phrase in candidates for word in phrase), dtype=np.intp
+        )
+        lengths = np.fromiter(map(len, candidates), dtype=np.intp, count=len(candidates))
+
+        # 词的度为其所在各短语长度之和（含自身），频次为出现次数
+        frequency = np.bincount(ids, minlength=len(vocab))
+        degree = np.bincount(ids, weights=np.repeat(lengths, lengths), minlength=len(vocab))
+        word_scores = degree / frequency
+
+        max_words = self.max_words
+        counts = Counter(phrase for phrase in candidates if len(phrase) <= max_words)
+        if not counts:
+            # 所有片段都超长时（如不含停用词的标题），改为在其中取 max_words 个词的窗口
+            counts = Counter(
+                phrase[start:start + max_words]
+                for phrase in candidates
+                for start in range(len(phrase) - max_words + 1)
+            )
+        phrases = list(counts)
+        phrase_lengths = np.fromiter(map(len, phrases), dtype=np.intp, count=len(phrases))
+        phrase_ids = np.fromiter((vocab[word] for phrase in phrases for word in phrase), dtype=np.intp)
+        offsets = np.concatenate(([0], np.cumsum(phrase_lengths)[:-1]))
+        scores = np.add.reduceat(word_scores[phrase_ids], offsets)
+        # 原始 RAKE 偏向只出现一次的长短语，乘以出现次数使主题更稳定
+        scores *= np.fromiter(counts.values(), dtype=float, count=len(phrases))
+
+        # 稳定排序，得分相同时保持首次出现的顺序
+        order = np.argsort(-scores, kind='stable')[:top_k]
+        return [(' '.join(phrases[i]), float(scores[i])) for i in order]
+
+    def extract(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        提取文本中得分最高的关键短语
+
+        Args:
+            text: 英文文本
+            top_k: 返回的短语数
+
+        Returns:
+            List[Tuple[str, float]]: 得分降序的 (短语, 得分)
+        """
+        return self.rank(self.candidates(text), top_k)
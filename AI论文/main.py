@@ -2,6 +2,7 @@
 主程序入口 - AI文本处理系统
 """
 
+import asyncio
 import logging
 import argparse
 import os
@@ -9,6 +10,8 @@ from typing import Dict, List
 from processor import TextProcessor
 from analyzer import TopicAnalyzer
 from crawler import LiteratureCrawler
+from paper import Paper
+from src.ai_client.ai_connector import AIConnector
 
 def setup_logging():
     """配置日志"""
@@ -43,6 +46,43 @@ def save_output_file(content: str, original_file: str, suffix: str):
         logging.error(f"保存文件失败: {str(e)}")
         raise
 
+async def generate_papers_async(processor: TextProcessor, original_text: str, references: List[Paper],
+                                topic_info: Dict, input_file: str):
+    """
+    并发生成中英文论文，每种语言完成后立即保存
+    
+    摘要切分、格式化和写文件都在线程池中执行，事件循环只负责网络请求，
+    一种语言的后处理不会阻塞另一种语言的流式读取。
+    """
+    loop = asyncio.get_running_loop()
+    async with AIConnector(processor.config) as connector:
+        # 超长原文只分段摘要一次，中英文共用
+        source_text = await processor.condense_source_async(connector, original_text)
+        
+        async def generate_english():
+            english_paper = await processor.process_english_async(
+                connector,
+                original_text=original_text,
+                references=references,
+                topic_info=topic_info,
+                source_text=source_text
+            )
+            logging.info("已生成英文版论文")
+            await loop.run_in_executor(None, save_output_file, english_paper, input_file, 'EN')
+            
+        async def generate_chinese():
+            chinese_paper = await processor.process_chinese_async(
+                connector,
+                original_text=original_text,
+                references=references,
+                topic_info=topic_info,
+                source_text=source_text
+            )
+            logging.info("已生成中文版论文")
+            await loop.run_in_executor(None, save_output_file, chinese_paper, input_file, 'CN')
+            
+        await asyncio.gather(generate_english(), generate_chinese())
+
 def main():
     """主函数"""
     # 设置日志
@@ -51,6 +91,19 @@ def main():
     # 解析命令行参数
     parser = argparse.ArgumentParser(description='学术论文生成器')
     parser.add_argument('input_file', help='输入文件路径')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='使用异步流水线并发生成中英文论文')
+    parser.add_argument('--job-id', help='任务标识，参考文献保存到 output/<job-id>/ 下')
+    parser.add_argument('--no-save-references', action='store_true',
+                        help='不将参考文献写入 references.txt')
+    parser.add_argument('--headless', action='store_true',
+                        help='以无头模式爬取文献，需要浏览器配置已登录过秘塔搜索')
+    parser.add_argument('--refresh-driver', action='store_true',
+                        help='忽略本地缓存，联网重新解析 Edge 驱动')
+    parser.add_argument('--refresh-crawl', action='store_true',
+                        help='忽略爬取结果缓存，重新爬取文献')
+    parser.add_argument('--index-idf', action='store_true',
+                        help='将输入文档计入语料IDF索引（IDF_INDEX_PATH）')
     args = parser.parse_args()
     
     try:
@@ -63,36 +116,61 @@ def main():
         topic_info = analyzer.analyze(original_text)
         logging.info("已完成主题分析")
         
+        # 按需将输入文档计入语料IDF索引，文档数达到 IDF_MIN_DOCUMENTS 后分析才会使用
+        if args.index_idf:
+            analyzer.add_to_index([original_text])
+        
         # 3. 爬取相关文献
-        crawler = LiteratureCrawler()
+        crawler = LiteratureCrawler(
+            job_id=args.job_id,
+            headless=args.headless or None,
+            refresh_driver=args.refresh_driver,
+            refresh_crawl=args.refresh_crawl
+        )
         references = crawler.crawl_literature(
             topic=topic_info['topic']['en'],
-            keywords=topic_info['keywords']['en']
+            keywords=topic_info['keywords']['en'],
+            save=not args.no_save_references
         )
         logging.info(f"已爬取 {len(references)} 篇相关文献")
         
         # 4. 处理文本
         processor = TextProcessor()
         
-        # 4.1 生成英文版
-        english_paper = processor.process_english(
-            original_text=original_text,
-            references=references,
-            topic_info=topic_info
-        )
-        logging.info("已生成英文版论文")
-        
-        # 4.2 生成中文版
-        chinese_paper = processor.process_chinese(
-            original_text=original_text,
-            references=references,
-            topic_info=topic_info
-        )
-        logging.info("已生成中文版论文")
-        
-        # 5. 保存结果
-        save_output_file(english_paper, args.input_file, 'EN')
-        save_output_file(chinese_paper, args.input_file, 'CN')
+        if args.use_async:
+            # 4-5. 并发生成中英文版并分别保存
+            asyncio.run(generate_papers_async(
+                processor,
+                original_text=original_text,
+                references=references,
+                topic_info=topic_info,
+                input_file=args.input_file
+            ))
+        else:
+            # 超长原文只分段摘要一次，中英文共用
+            source_text = processor.condense_source(original_text)
+            
+            # 4.1 生成英文版
+            english_paper = processor.process_english(
+                original_text=original_text,
+                references=references,
+                topic_info=topic_info,
+                source_text=source_text
+            )
+            logging.info("已生成英文版论文")
+            
+            # 4.2 生成中文版
+            chinese_paper = processor.process_chinese(
+                original_text=original_text,
+                references=references,
+                topic_info=topic_info,
+                source_text=source_text
+            )
+            logging.info("已生成中文版论文")
+            
+            # 5. 保存结果
+            save_output_file(english_paper, args.input_file, 'EN')
+            save_output_file(chinese_paper, args.input_file, 'CN')
         
         logging.info("处理完成")
         return 0
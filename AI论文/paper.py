@@ -0,0 +1,129 @@
+"""
+文献记录模块 - 爬虫到论文生成全流程共用的紧凑文献类型
+"""
+
+import json
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Sequence
+
+_YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+
+
+class Paper:
+    """
+    单篇文献记录
+
+    使用 __slots__ 避免每条记录携带实例字典；正文（与标题、来源大量重复）
+    以 zlib 压缩后保存，只在访问 content 时解压。
+    """
+
+    __slots__ = ('title', 'source', 'date', 'is_pdf', 'url', 'authors', '_content')
+
+    def __init__(self, title: str, source: str = "", date: str = "", is_pdf: bool = False,
+                 url: str = "", authors: Sequence[str] = (), content: str = ""):
+        """
+        初始化文献记录
+
+        Args:
+            title: 标题
+            source: 来源（期刊、网站等）
+            date: 发表日期，格式为 YYYY-MM-DD 或只含年份
+            is_pdf: 是否为PDF文献
+            url: 文献链接
+            authors: 作者列表
+            content: 搜索结果中的完整文本
+        """
+        self.title = title
+        self.source = source
+        self.date = date
+        self.is_pdf = is_pdf
+        self.url = url
+        self.authors = tuple(authors)
+        self.content = content
+
+    @property
+    def content(self) -> str:
+        return self.decompress_content(self._content)
+
+    @content.setter
+    def content(self, value: str):
+        self._content = zlib.compress(value.encode('utf-8')) if value else b""
+
+    @property
+    def compressed_content(self) -> bytes:
+        """压缩后的正文，可直接比较或作为缓存键而无需解压"""
+        return self._content
+
+    @staticmethod
+    def decompress_content(data: bytes) -> str:
+        """将 compressed_content 还原为正文"""
+        return zlib.decompress(data).decode('utf-8') if data else ""
+
+    @property
+    def year(self) -> str:
+        """从日期中解析的年份，未知时为空字符串"""
+        match = _YEAR_RE.search(self.date or "")
+        return match.group(0) if match else ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典"""
+        return {
+            "title": self.title,
+            "source": self.source,
+            "date": self.date,
+            "is_pdf": self.is_pdf,
+            "url": self.url,
+            "authors": list(self.authors),
+            "content": self.content
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Paper':
+        """由字典创建记录，忽略未知字段，兼容只有 year 没有 date 的旧数据"""
+        return cls(
+            title=data.get("title", ""),
+            source=data.get("source") or "",
+            date=data.get("date") or str(data.get("year") or ""),
+            is_pdf=bool(data.get("is_pdf")),
+            url=data.get("url") or "",
+            authors=data.get("authors") or (),
+            content=data.get("content") or ""
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Paper):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Paper(title={self.title!r}, source={self.source!r}, date={self.date!r})"
+
+
+def dumps_papers(papers: Iterable[Paper]) -> str:
+    """
+    将文献列表序列化为 JSON 字符串
+
+    Args:
+        papers: 文献列表
+
+    Returns:
+        str: JSON 字符串
+    """
+    return json.dumps([paper.to_dict() for paper in papers], ensure_ascii=False, separators=(',', ':'))
+
+
+def loads_papers(text: str) -> List[Paper]:
+    """
+    由 JSON 字符串还原文献列表
+
+    Args:
+        text: dumps_papers 生成的字符串
+
+    Returns:
+        List[Paper]: 文献列表
+    """
+    return [Paper.from_dict(item) for item in json.loads(text)]
+
@@ -0,0 +1,119 @@
+"""
+PDF文本提取模块 - 基于内存映射的逐页流式提取，支持按页并行和长度上限
+"""
+
+import logging
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _open_reader(file_path: str) -> Iterator[PyPDF2.PdfReader]:
+    """以内存映射方式打开PDF，页面内容按需从映射中读取"""
+    with open(file_path, 'rb') as file:
+        try:
+            stream = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射，交给 PdfReader 报告格式错误
+            stream = None
+        try:
+            yield PyPDF2.PdfReader(stream if stream is not None else file)
+        finally:
+            if stream is not None:
+                stream.close()
+
+
+def iter_pdf_pages(file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """
+    逐页产出PDF文本
+
+    Args:
+        file_path: PDF文件路径
+        start: 起始页（含）
+        stop: 结束页（不含），None 表示到最后一页
+
+    Yields:
+        str: 每一页的文本
+    """
+    with _open_reader(file_path) as reader:
+        page_count = len(reader.pages)
+        stop = page_count if stop is None else min(stop, page_count)
+        for index in range(start, stop):
+            yield reader.pages[index].extract_text() or ''
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """在工作进程中提取一段页面的文本"""
+    return list(iter_pdf_pages(file_path, start, stop))
+
+
+def extract_pdf(file_path: str, max_chars: Optional[int] = None, max_pages: Optional[int] = None,
+                workers: int = 1, parallel_min_pages: int = 200) -> Dict[str, Any]:
+    """
+    提取PDF文本和元数据
+
+    Args:
+        file_path: PDF文件路径
+        max_chars: 最多提取的字符数，None 或 0 表示不限制
+        max_pages: 最多提取的页数，None 或 0 表示不限制
+        workers: 并行提取的进程数，1 表示在当前进程中逐页提取
+        parallel_min_pages: 页数达到该值时才启用并行提取
+
+    Returns:
+        Dict[str, Any]: 包含 content、metadata、pages 的字典
+    """
+    with _open_reader(file_path) as reader:
+        page_count = len(reader.pages)
+        metadata = reader.metadata or {}
+        # 在映射关闭前解析元数据中的间接对象
+        metadata = {key: metadata[key] for key in metadata}
+
+    stop = min(page_count, max_pages) if max_pages else page_count
+    parts = []
+    length = 0
+
+    def page_texts() -> Iterator[str]:
+        if workers > 1 and stop >= parallel_min_pages:
+            # 按页段切分，各进程独立映射文件，结果按页序合并
+            step = -(-stop // (workers * 4))
+            ranges = [(start, min(start + step, stop)) for start in range(0, stop, step)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_extract_page_range, file_path, start, end) for start, end in ranges]
+                try:
+                    for future in futures:
+                        yield from future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+        else:
+            yield from iter_pdf_pages(file_path, 0, stop)
+
+    pages = page_texts()
+    try:
+        for text in pages:
+            if max_chars and length + len(text) >= max_chars:
+                parts.append(text[:max_chars - length])
+                logger.info(f"PDF文本已达到 {max_chars} 字符上限，停止提取")
+                break
+            parts.append(text)
+            length += len(text)
+    finally:
+        pages.close()
+
+    return {
+        "content": "".join(parts),
+        "metadata": metadata,
+        "pages": page_count
+    }
+
+
+def default_pdf_workers(max_workers: int) -> int:
+    """并行提取使用的进程数，不超过CPU核数"""
+    return max(1, min(max_workers, os.cpu_count() or 1))
@@ -0,0 +1,66 @@
+"""
+短语匹配模块 - 将短语表编译为按前缀树组织的正则，一次扫描匹配所有短语
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Tuple
+
+# 永不匹配的模式，用于空短语表
+_NEVER = '(?!)'
+
+
+def _build_trie(phrases: Iterable[str]) -> Dict[str, dict]:
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        if not phrase:
+            continue
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        # 空串键标记短语结尾
+        node[''] = {}
+    return trie
+
+
+def _render(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _render(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    if len(branches) == 1 and '' not in node:
+        return branches[0]
+    group = '(?:' + '|'.join(branches) + ')'
+    # 短语在此结束时后续部分可选；贪婪匹配优先尝试更长的短语
+    return group + '?' if '' in node else group
+
+
+def trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    将短语表转换为前缀树形式的正则分支
+
+    共同前缀只匹配一次，每个位置只需沿一条分支比较，匹配时优先最长的短语。
+
+    Args:
+        phrases: 短语（重复和空串会被忽略）
+
+    Returns:
+        str: 正则表达式，短语表为空时返回永不匹配的模式
+    """
+    return _render(_build_trie(phrases)) or _NEVER
+
+
+@lru_cache(maxsize=16)
+def compile_phrases(phrases: Tuple[str, ...], prefix: str = '', suffix: str = '', flags: int = 0) -> re.Pattern:
+    """
+    编译短语表，相同短语表和上下文只编译一次
+
+    Args:
+        phrases: 短语元组（作为缓存键）
+        prefix: 短语前需满足的正则，如单词边界
+        suffix: 短语后需满足的正则，匹配内容一并删除
+        flags: 正则标志
+
+    Returns:
+        re.Pattern: 编译后的正则
+    """
+    return re.compile(f'{prefix}(?:{trie_pattern(phrases)}){suffix}', flags)
@@ -6,11 +6,20 @@ import asyncio
 import aiohttp
 import json
 import logging
-import PyPDF2
-from typing import Dict, Any, AsyncGenerator, List, Tuple
+import os
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Any, AsyncGenerator, Callable, Iterator, List, Optional, Tuple
 from config import Config
+from pdf_extractor import default_pdf_workers, extract_pdf
+from prompt_budget import chunk_text, estimate_tokens, fit_entries, truncate_to_tokens
+from reference_renderer import join_reference_entries, render_reference_entries
+from paper import Paper
+from formatter import format_chinese_paper, format_english_paper, get_format_rules
+from sse import StreamStatus, iter_sse_content
 import re
-import http.client
+from http_pool import API_HOST, CHAT_ENDPOINT, get_pool
+from response_cache import get_response_cache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -19,62 +28,217 @@ class TextProcessor:
     
     def __init__(self):
         self.config = Config()
-        self.conn = http.client.HTTPSConnection("gpt-5.vip")
+        # 共享连接池，多个处理器实例和线程复用同一组长连接
+        self.pool = get_pool(
+            API_HOST,
+            size=self.config.MAX_WORKERS,
+            timeout=self.config.TIMEOUT,
+            read_timeout=self.config.READ_TIMEOUT or None
+        )
+        # 响应缓存，相同模型和消息的请求直接返回已有结果
+        self.cache = get_response_cache(self.config)
+        # 由配置生成的格式化规则，相同配置的处理器共享同一份编译结果
+        self.format_rules = get_format_rules(self.config)
         self.headers = {
             'Authorization': '',
             'User-Agent': 'Apifox/1.0.0 (https://apifox.com)',
             'Content-Type': 'application/json',
             'Accept': '*/*',
-            'Host': 'gpt-5.vip',
+            'Host': API_HOST,
             'Connection': 'keep-alive'
         }
         
-    def _make_ai_request(self, messages: List[Dict]) -> str:
-        """发送AI请求并获取响应"""
+    def stream_ai_request(self, messages: List[Dict], status: Optional[StreamStatus] = None) -> Iterator[str]:
+        """
+        发送AI请求并在数据到达时逐个产出内容片段
+        
+        Args:
+            messages: 对话消息列表
+            status: 可选，记录响应是否完整结束
+            
+        Yields:
+            模型生成的文本片段
+            
+        提前停止迭代时应调用生成器的 close()（或用 contextlib.closing 包裹），
+        以便立即关闭未读完的连接并归还连接池名额。
+        """
+        payload = json.dumps({
+            "model": self.config.AI_MODEL,
+            "messages": messages,
+            "stream": True
+        })
+        
+        conn = self.pool.acquire()
+        discard = True
         try:
-            payload = json.dumps({
-                "model": "gpt-4o-mini",
-                "messages": messages,
-                "stream": True
-            })
-            
-            self.conn.request("POST", "/v1/chat/completions", payload, self.headers)
-            response = self.conn.getresponse()
-            data = response.read()
-            result = data.decode("utf-8")
-            
-            # 解析流式响应
-            response_text = ""
-            for line in result.strip().split('\n'):
-                if line.startswith('data: '):
-                    try:
-                        json_str = line[6:]  # 移除 'data: ' 前缀
-                        if json_str.strip() == '[DONE]':
-                            continue
-                        response_data = json.loads(json_str)
-                        if 'choices' in response_data and len(response_data['choices']) > 0:
-                            delta = response_data['choices'][0].get('delta', {})
-                            if 'content' in delta:
-                                response_text += delta['content']
-                    except json.JSONDecodeError:
-                        continue
-                        
+            response = self.pool.send(conn, "POST", CHAT_ENDPOINT, payload, self.headers)
+            if response.status != 200:
+                error_msg = response.read().decode("utf-8", errors="replace")
+                raise Exception(f"API请求失败: {response.status} - {error_msg}")
+                
+            # 按行读取，边接收边解析
+            yield from iter_sse_content(response, status)
+            
+            # 读完剩余数据，保证连接可以归还复用
+            response.read()
+            discard = False
+        finally:
+            # 出错或调用方提前停止迭代时关闭连接，名额总会归还
+            self.pool.release(conn, discard=discard)
+            
+    def _make_ai_request(self, messages: List[Dict], on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        发送AI请求并获取响应
+        
+        Args:
+            messages: 对话消息列表
+            on_token: 每收到一个内容片段时调用的回调，可用于边生成边写盘
+            
+        Returns:
+            str: 完整的生成文本
+        """
+        try:
+            cache_key = make_cache_key(self.config.AI_MODEL, messages) if self.cache else None
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("命中响应缓存")
+                    if on_token:
+                        on_token(cached)
+                    return cached
+                    
+            parts = []
+            status = StreamStatus()
+            with closing(self.stream_ai_request(messages, status)) as stream:
+                for content in stream:
+                    parts.append(content)
+                    if on_token:
+                        on_token(content)
+            response_text = "".join(parts)
+            
+            # 被截断的响应（连接提前关闭、超出长度）不写入缓存，避免之后一直返回残缺的结果
+            if cache_key and response_text and status.complete:
+                self.cache.set(cache_key, response_text)
+            elif not status.complete:
+                logger.warning(f"响应未完整结束（finish_reason={status.finish_reason}），不写入缓存")
             return response_text
             
         except Exception as e:
             logger.error(f"AI请求失败: {str(e)}")
             raise
             
-    def _build_english_prompt(self, original_text: str, references: List[Dict], topic_info: Dict) -> str:
-        """构建英文提示词"""
-        # 读取参考文献文件
-        references_text = ""
-        try:
-            with open("output/references.txt", 'r', encoding='utf-8') as f:
-                references_text = f.read()
-        except Exception as e:
-            logger.error(f"读取参考文献失败: {str(e)}")
+    def _render_references(self, references: List[Paper]) -> str:
+        """
+        将内存中的参考文献渲染为提示词文本，并按 Config.REFERENCE_TOKEN_BUDGET 裁剪
+        
+        渲染结果按文献内容缓存，中英文提示词共用同一份。
+        """
+        if not references:
+            return ""
+        entries = render_reference_entries(references)
+        selected = fit_entries(entries, self.config.REFERENCE_TOKEN_BUDGET)
+        if len(selected) < len(entries):
+            logger.info(f"参考文献超出预算，保留 {len(selected)}/{len(entries)} 条")
+        return join_reference_entries(selected)
+        
+    def _text_token_budget(self, system_prompt: str = "") -> int:
+        """原始文本可用的token预算：上下文窗口减去输出预留、系统提示词和参考文献预算"""
+        return (
+            self.config.CONTEXT_WINDOW
+            - self.config.RESERVED_OUTPUT_TOKENS
+            - self.config.REFERENCE_TOKEN_BUDGET
+            - estimate_tokens(system_prompt)
+            - _PROMPT_OVERHEAD_TOKENS
+        )
+        
+    def _source_token_budget(self) -> int:
+        """中英文提示词共用的原始文本预算，取两种语言预算中较小的一个"""
+        return min(
+            self._text_token_budget(self.config.SYSTEM_PROMPT_EN),
+            self._text_token_budget(self.config.SYSTEM_PROMPT_CN)
+        )
+        
+    def condense_source(self, original_text: str) -> str:
+        """
+        将原始文本压缩到中英文提示词都能容纳的长度，每次运行只需调用一次
+        
+        结果传给 process_english / process_chinese 的 source_text 参数，
+        避免两种语言各自对同一文本做一遍分段摘要。
+        
+        Args:
+            original_text: 原始文本
             
+        Returns:
+            str: 不超过预算的文本
+        """
+        return self._condense_text(original_text, self._source_token_budget())
+        
+    async def condense_source_async(self, connector, original_text: str) -> str:
+        """condense_source 的异步版本，通过 AIConnector 并发摘要"""
+        return await self._condense_text_async(connector, original_text, self._source_token_budget())
+        
+    def _build_summary_messages(self, chunk: str) -> List[Dict]:
+        """构建分段摘要的对话消息"""
+        prompt = f"""请对以下文本片段进行详细摘要，保留关键论点、研究方法、实验数据和结论，不要添加原文没有的信息：
+
+{chunk}"""
+        return [
+            {"role": "user", "content": prompt}
+        ]
+        
+    def _split_over_budget(self, text: str, budget: int) -> Optional[List[str]]:
+        """文本超出预算时切分为待摘要的片段，未超出时返回 None"""
+        if estimate_tokens(text) <= budget:
+            return None
+        return chunk_text(text, self.config.CHUNK_TOKENS)
+        
+    def _condense_text(self, text: str, budget: int) -> str:
+        """
+        文本超出预算时切分为片段并发摘要（map），再合并摘要（reduce）
+        
+        Args:
+            text: 原始文本
+            budget: token预算
+            
+        Returns:
+            str: 不超过预算的文本
+        """
+        for _ in range(_MAX_REDUCE_ROUNDS):
+            chunks = self._split_over_budget(text, budget)
+            if chunks is None:
+                return text
+            logger.info(f"文本超出预算，分为 {len(chunks)} 段并发摘要")
+            with ThreadPoolExecutor(max_workers=min(self.config.MAX_WORKERS, len(chunks))) as executor:
+                summaries = list(executor.map(
+                    lambda chunk: self._make_ai_request(self._build_summary_messages(chunk)),
+                    chunks
+                ))
+            text = _join_summaries(summaries)
+        return truncate_to_tokens(text, budget)
+        
+    async def _condense_text_async(self, connector, text: str, budget: int) -> str:
+        """_condense_text 的异步版本，通过 AIConnector 并发摘要"""
+        loop = asyncio.get_running_loop()
+        for _ in range(_MAX_REDUCE_ROUNDS):
+            # 长文本的估算和切分较耗CPU，在线程池中执行，不阻塞事件循环上的其他请求
+            chunks = await loop.run_in_executor(None, self._split_over_budget, text, budget)
+            if chunks is None:
+                return text
+            logger.info(f"文本超出预算，分为 {len(chunks)} 段并发摘要")
+            semaphore = asyncio.Semaphore(self.config.MAX_WORKERS)
+            
+            async def summarize(chunk: str) -> str:
+                async with semaphore:
+                    return await connector.chat(self._build_summary_messages(chunk))
+                    
+            summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+            text = _join_summaries(summaries)
+        return await loop.run_in_executor(None, truncate_to_tokens, text, budget)
+        
+    def _build_english_prompt(self, original_text: str, references: List[Paper], topic_info: Dict) -> str:
+        """构建英文提示词"""
+        references_text = self._render_references(references)
+        
         prompt_parts = [
             "Please write a high-quality academic paper in English based on the following information:",
             "\nOriginal Text:",
@@ -97,16 +261,10 @@ class TextProcessor:
         
         return "\n".join(prompt_parts)
         
-    def _build_chinese_prompt(self, original_text: str, references: List[Dict], topic_info: Dict) -> str:
+    def _build_chinese_prompt(self, original_text: str, references: List[Paper], topic_info: Dict) -> str:
         """构建中文提示词"""
-        # 读取参考文献文件
-        references_text = ""
-        try:
-            with open("output/references.txt", 'r', encoding='utf-8') as f:
-                references_text = f.read()
-        except Exception as e:
-            logger.error(f"读取参考文献失败: {str(e)}")
-            
+        references_text = self._render_references(references)
+        
         prompt_parts = [
             "请根据以下信息撰写一篇高质量的中文学术论文：",
             "\n原始文本：",
@@ -135,77 +293,7 @@ class TextProcessor:
     def _format_english_paper(self, text: str) -> str:
         """格式化英文论文"""
         try:
-            # 1. 移除AI生成特征
-            ai_patterns = [
-                r'As an AI .*?,',
-                r'I apologize,.*?\.', 
-                r'I cannot.*?\.', 
-                r'I do not have.*?\.', 
-                r'I\'m sorry,.*?\.', 
-                r'I am not able to.*?\.', 
-                r'I must inform you.*?\.', 
-                r'Please note that.*?\.', 
-                r'It\'s important to note.*?\.', 
-                r'I would recommend.*?\.', 
-                r'I suggest.*?\.', 
-                r'In my opinion.*?\.', 
-                r'Based on my understanding.*?\.', 
-                r'From my perspective.*?\.', 
-                r'As far as I know.*?\.', 
-                r'To the best of my knowledge.*?\.'
-            ]
-            for pattern in ai_patterns:
-                text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-            
-            # 2. 移除机械化过渡词
-            transition_words = [
-                r'\bHowever,\s+', r'\bMoreover,\s+', r'\bFurthermore,\s+',
-                r'\bTherefore,\s+', r'\bThus,\s+', r'\bHence,\s+',
-                r'\bConsequently,\s+', r'\bNevertheless,\s+', r'\bNonetheless,\s+',
-                r'\bIn addition,\s+', r'\bBesides,\s+', r'\bMeanwhile,\s+',
-                r'\bSubsequently,\s+', r'\bAs a result,\s+', r'\bFor instance,\s+',
-                r'\bFor example,\s+', r'\bIn other words,\s+', r'\bThat is to say,\s+',
-                r'\bIn conclusion,\s+', r'\bTo sum up,\s+', r'\bOverall,\s+'
-            ]
-            for word in transition_words:
-                text = re.sub(word, '', text)
-            
-            # 3. 移除多余的标记
-            text = re.sub(r'\*\*|\#\#|__', '', text)
-            
-            # 4. 格式化段落和空白
-            text = re.sub(r'\s+', ' ', text)  # 统一空白字符
-            text = re.sub(r'([.!?])\s+([A-Z])', r'\1\n\n\2', text)  # 段落分隔
-            
-            # 5. 处理章节标题格式
-            sections = ['Title', 'Abstract', 'Introduction', 'Methods', 'Results', 'Discussion', 'Conclusion', 'References']
-            for section in sections:
-                text = re.sub(f'({section}:?)', r'\n\n\1\n', text)
-            
-            # 6. 规范化引用格式
-            text = re.sub(r'\((\d{4})\)', r' [\1]', text)  # 将(2023)改为[2023]
-            text = re.sub(r'et\s+al\.', 'et al.', text)  # 规范化et al.
-            
-            # 7. 确保段落缩进
-            lines = text.split('\n')
-            formatted_lines = []
-            for line in lines:
-                if line.strip():
-                    if any(section in line for section in sections):
-                        formatted_lines.append(line.strip())
-                    else:
-                        formatted_lines.append('    ' + line.strip())
-                else:
-                    formatted_lines.append('')
-            
-            text = '\n'.join(formatted_lines)
-            
-            # 8. 规范化标题格式
-            text = re.sub(r'^Title\s*\n\s*(.+?)(?=\n\n)', 
-                         lambda m: f'Title\n{m.group(1).upper()}', text)
-            
-            return text.strip()
-                
+            return format_english_paper(text, self.format_rules)
         except Exception as e:
             logger.error(f"格式化英文论文时出错: {str(e)}")
             return text
@@ -213,234 +301,237 @@ class TextProcessor:
     def _format_chinese_paper(self, text: str) -> str:
         """格式化中文论文"""
         try:
-            # 1. 移除AI生成特征
-            ai_patterns = [
-                r'作为人工智能.*?，',
-                r'我认为.*?。',
-                r'我的理解是.*?。',
-                r'我不能.*?。',
-                r'我必须说明.*?。',
-                r'请注意.*?。',
-                r'需要说明的是.*?。',
-                r'我建议.*?。',
-                r'我的观点是.*?。',
-                r'据我所知.*?。',
-                r'本文.*?。',
-                r'我们.*?。'
-            ]
-            for pattern in ai_patterns:
-                text = re.sub(pattern, '', text)
-            
-            # 2. 移除机械化过渡词
-            transition_words = [
-                r'然而，', r'但是，', r'不过，', r'因此，', r'所以，',
-                r'此外，', r'另外，', r'而且，', r'并且，', r'接着，',
-                r'随后，', r'总之，', r'总而言之，', r'综上所述，',
-                r'例如，', r'比如，', r'换句话说，', r'也就是说，',
-                r'值得注意的是，', r'需要指出的是，', r'显然，', r'显而易见，',
-                r'毫无疑问，', r'众所周知，', r'一般来说，', r'通常来说，'
-            ]
-            for word in transition_words:
-                text = text.replace(word, '')
-            
-            # 3. 移除多余的标记
-            text = re.sub(r'\*\*|\#|__', '', text)
-            
-            # 4. 格式化段落和空白
-            text = re.sub(r'\s+', ' ', text)  # 统一空白字符
-            text = re.sub(r'([。！？])\s*([^，。！？、])', r'\1\n\n\2', text)  # 段落分隔
-            
-            # 5. 处理章节标题格式
-            sections = ['标题', '摘要', '引言', '研究方法', '研究结果', '讨论', '结论', '参考文献']
-            for section in sections:
-                text = re.sub(f'({section})', r'\n\n\1\n', text)
-            
-            # 6. 规范化引用格式
-            text = re.sub(r'（(\d{4})）', r'[\1]', text)  # 将（2023）改为[2023]
-            text = re.sub(r'等人', '', text)  # 移除"等人"
-            text = re.sub(r'等', '', text)  # 移除"等"
-            
-            # 7. 确保段落缩进
-            lines = text.split('\n')
-            formatted_lines = []
-            for line in lines:
-                if line.strip():
-                    if any(section in line for section in sections):
-                        formatted_lines.append(line.strip())
-                    else:
-                        formatted_lines.append('    ' + line.strip())
-                else:
-                    formatted_lines.append('')
-            
-            text = '\n'.join(formatted_lines)
-            
-            # 8. 规范化标题格式
-            text = re.sub(r'^标题\s*\n\s*(.+?)(?=\n\n)', 
-                         lambda m: f'标题\n{m.group(1)}', text)
-            
-            # 9. 移除特殊字符
-            text = re.sub(r'[^\u4e00-\u9fa5a-zA-Z0-9，。！？、：；''""（）【】《》\[\]\s\.]', '', text)
-            
-            return text.strip()
-            
+            return format_chinese_paper(text, self.format_rules)
         except Exception as e:
             logger.error(f"格式化中文论文时出错: {str(e)}")
             return text
             
-    def _add_references_english(self, text: str, references: List[Dict]) -> str:
+    def _add_references_english(self, text: str, references: List[Paper]) -> str:
         """添加英文参考文献"""
-        try:
-            # 添加参考文献部分标题
-            text += "\n\nReferences\n\n"
-            
-            # 格式化每个参考文献
-            for i, ref in enumerate(references, 1):
-                authors = ", ".join(ref['authors'])
-                title = ref['title']
-                year = ref['year']
-                source = ref['source']
-                
-                reference = f"[{i}] {authors}. ({year}). {title}. {source}."
-                if ref.get('url'):
-                    reference += f" Retrieved from {ref['url']}"
-                    
-                text += reference + "\n\n"
+        # 添加参考文献部分标题
+        text += "\n\nReferences\n\n"
+        
+        # 格式化每个参考文献，缺少的作者、年份和链接直接省略
+        for i, ref in enumerate(references, 1):
+            reference = f"[{i}] "
+            if ref.authors:
+                reference += f"{', '.join(ref.authors)}. "
+            if ref.year:
+                reference += f"({ref.year}). "
+            reference += f"{ref.title}."
+            if ref.source:
+                reference += f" {ref.source}."
+            if ref.url:
+                reference += f" Retrieved from {ref.url}"
                 
-            return text
+            text += reference + "\n\n"
             
-        except Exception as e:
-            logger.error(f"添加英文参考文献时出错: {str(e)}")
-            return text
+        return text
             
-    def _add_references_chinese(self, text: str, references: List[Dict]) -> str:
+    def _add_references_chinese(self, text: str, references: List[Paper]) -> str:
         """添加中文参考文献"""
-        try:
-            # 添加参考文献部分标题
-            text += "\n\n参考文献\n\n"
-            
-            # 格式化每个参考文献
-            for i, ref in enumerate(references, 1):
-                authors = "，".join(ref['authors'])
-                title = ref['title']
-                year = ref['year']
-                source = ref['source']
-                
-                reference = f"[{i}] {authors}. {title}[J]. {source}, {year}."
-                if ref.get('url'):
-                    reference += f" 来源：{ref['url']}"
-                    
-                text += reference + "\n\n"
+        # 添加参考文献部分标题
+        text += "\n\n参考文献\n\n"
+        
+        # 格式化每个参考文献，缺少的作者、年份和链接直接省略
+        for i, ref in enumerate(references, 1):
+            reference = f"[{i}] "
+            if ref.authors:
+                reference += f"{'，'.join(ref.authors)}. "
+            reference += f"{ref.title}[J]."
+            details = ", ".join(part for part in (ref.source, ref.year) if part)
+            if details:
+                reference += f" {details}."
+            if ref.url:
+                reference += f" 来源：{ref.url}"
                 
-            return text
-            
-        except Exception as e:
-            logger.error(f"添加中文参考文献时出错: {str(e)}")
-            return text
+            text += reference + "\n\n"
+            
+        return text
+            
+    def _build_english_messages(self, original_text: str, references: List[Paper], topic_info: Dict) -> List[Dict]:
+        """构建英文论文的对话消息"""
+        prompt = self._build_english_prompt(
+            original_text=original_text,
+            references=references,
+            topic_info=topic_info
+        )
+        return [
+            {"role": "system", "content": self.config.SYSTEM_PROMPT_EN},
+            {"role": "user", "content": prompt}
+        ]
+        
+    def _finalize_english(self, generated_text: str, references: List[Paper]) -> str:
+        """格式化生成的英文论文并添加参考文献"""
+        # 1. 格式化论文
+        formatted_text = self._format_english_paper(generated_text)
+        
+        # 2. 移除重复的参考文献部分
+        if 'References' in formatted_text:
+            parts = formatted_text.split('References', 1)
+            formatted_text = parts[0] + 'References' + parts[1].split('References')[0]
         
-    def process_english(self, original_text: str, references: List[Dict], topic_info: Dict) -> str:
-        """处理并生成英文版论文"""
+        # 3. 添加参考文献
+        return self._add_references_english(formatted_text, references)
+        
+    def process_english(self, original_text: str, references: List[Paper], topic_info: Dict,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        source_text: Optional[str] = None) -> str:
+        """
+        处理并生成英文版论文，on_token 可接收生成过程中的文本片段
+        
+        source_text 为 condense_source 的结果，未提供时按英文预算压缩原始文本。
+        """
         try:
-            # 1. 构建提示词
-            prompt = self._build_english_prompt(
-                original_text=original_text,
-                references=references,
-                topic_info=topic_info
-            )
-            
-            # 2. 调用AI生成论文
-            messages = [
-                {"role": "system", "content": self.config.SYSTEM_PROMPT_EN},
-                {"role": "user", "content": prompt}
-            ]
-            generated_text = self._make_ai_request(messages)
-            
-            # 3. 格式化论文
-            formatted_text = self._format_english_paper(generated_text)
-            
-            # 4. 移除重复的参考文献部分
-            if 'References' in formatted_text:
-                parts = formatted_text.split('References', 1)
-                formatted_text = parts[0] + 'References' + parts[1].split('References')[0]
-            
-            # 5. 添加参考文献
-            final_text = self._add_references_english(formatted_text, references)
-            
-            return final_text
+            if source_text is None:
+                source_text = self._condense_text(original_text, self._text_token_budget(self.config.SYSTEM_PROMPT_EN))
+            messages = self._build_english_messages(source_text, references, topic_info)
+            generated_text = self._make_ai_request(messages, on_token=on_token)
+            return self._finalize_english(generated_text, references)
             
         except Exception as e:
             logger.error(f"处理英文论文时出错: {str(e)}")
             return original_text
             
-    def process_chinese(self, original_text: str, references: List[Dict], topic_info: Dict) -> str:
-        """处理并生成中文版论文"""
+    async def process_english_async(self, connector, original_text: str, references: List[Paper], topic_info: Dict,
+                                   source_text: Optional[str] = None) -> str:
+        """
+        异步处理并生成英文版论文
+        
+        Args:
+            connector: 已进入上下文的AIConnector实例
+            original_text: 原始文本
+            references: 参考文献列表
+            topic_info: 主题分析结果
+            source_text: condense_source_async 的结果，未提供时按英文预算压缩原始文本
+            
+        Returns:
+            str: 英文版论文，失败时返回原始文本
+        """
         try:
-            # 1. 构建提示词
-            prompt = self._build_chinese_prompt(
-                original_text=original_text,
-                references=references,
-                topic_info=topic_info
+            if source_text is None:
+                source_text = await self._condense_text_async(
+                    connector, original_text, self._text_token_budget(self.config.SYSTEM_PROMPT_EN)
+                )
+            messages = self._build_english_messages(source_text, references, topic_info)
+            generated_text = await connector.chat(messages)
+            # 格式化为CPU密集的正则处理，在线程池中执行，避免阻塞另一种语言的流式读取
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._finalize_english, generated_text, references
             )
             
-            # 2. 调用AI生成论文
-            messages = [
-                {"role": "system", "content": self.config.SYSTEM_PROMPT_CN},
-                {"role": "user", "content": prompt}
-            ]
-            generated_text = self._make_ai_request(messages)
-            
-            # 3. 格式化论文
-            formatted_text = self._format_chinese_paper(generated_text)
+        except Exception as e:
+            logger.error(f"处理英文论文时出错: {str(e)}")
+            return original_text
             
-            # 4. 移除重复的参考文献部分
-            if '参考文献' in formatted_text:
-                parts = formatted_text.split('参考文献', 1)
-                formatted_text = parts[0] + '参考文献' + parts[1].split('参考文献')[0]
+    def _build_chinese_messages(self, original_text: str, references: List[Paper], topic_info: Dict) -> List[Dict]:
+        """构建中文论文的对话消息"""
+        prompt = self._build_chinese_prompt(
+            original_text=original_text,
+            references=references,
+            topic_info=topic_info
+        )
+        return [
+            {"role": "system", "content": self.config.SYSTEM_PROMPT_CN},
+            {"role": "user", "content": prompt}
+        ]
+        
+    def _finalize_chinese(self, generated_text: str, references: List[Paper]) -> str:
+        """格式化生成的中文论文并添加参考文献"""
+        # 1. 格式化论文
+        formatted_text = self._format_chinese_paper(generated_text)
+        
+        # 2. 移除重复的参考文献部分
+        if '参考文献' in formatted_text:
+            parts = formatted_text.split('参考文献', 1)
+            formatted_text = parts[0] + '参考文献' + parts[1].split('参考文献')[0]
+        
+        # 3. 添加参考文献
+        return self._add_references_chinese(formatted_text, references)
+        
+    def process_chinese(self, original_text: str, references: List[Paper], topic_info: Dict,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        source_text: Optional[str] = None) -> str:
+        """
+        处理并生成中文版论文，on_token 可接收生成过程中的文本片段
+        
+        source_text 为 condense_source 的结果，未提供时按中文预算压缩原始文本。
+        """
+        try:
+            if source_text is None:
+                source_text = self._condense_text(original_text, self._text_token_budget(self.config.SYSTEM_PROMPT_CN))
+            messages = self._build_chinese_messages(source_text, references, topic_info)
+            generated_text = self._make_ai_request(messages, on_token=on_token)
+            return self._finalize_chinese(generated_text, references)
             
-            # 5. 添加参考文献
-            final_text = self._add_references_chinese(formatted_text, references)
+        except Exception as e:
+            logger.error(f"处理中文论文时出错: {str(e)}")
+            return original_text
             
-            return final_text
+    async def process_chinese_async(self, connector, original_text: str, references: List[Paper], topic_info: Dict,
+                                   source_text: Optional[str] = None) -> str:
+        """
+        异步处理并生成中文版论文
+        
+        Args:
+            connector: 已进入上下文的AIConnector实例
+            original_text: 原始文本
+            references: 参考文献列表
+            topic_info: 主题分析结果
+            source_text: condense_source_async 的结果，未提供时按中文预算压缩原始文本
+            
+        Returns:
+            str: 中文版论文，失败时返回原始文本
+        """
+        try:
+            if source_text is None:
+                source_text = await self._condense_text_async(
+                    connector, original_text, self._text_token_budget(self.config.SYSTEM_PROMPT_CN)
+                )
+            messages = self._build_chinese_messages(source_text, references, topic_info)
+            generated_text = await connector.chat(messages)
+            # 与英文版相同，格式化在线程池中执行
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._finalize_chinese, generated_text, references
+            )
             
         except Exception as e:
             logger.error(f"处理中文论文时出错: {str(e)}")
             return original_text
             
-    def parse_pdf(self, file_path: str) -> Dict[str, Any]:
-        """解析PDF文件"""
+    def parse_pdf(self, file_path: str, max_chars: Optional[int] = None, max_pages: Optional[int] = None,
+                  workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        解析PDF文件
+        
+        Args:
+            file_path: PDF文件路径
+            max_chars: 最多提取的字符数，默认使用 Config.PDF_MAX_CHARS
+            max_pages: 最多提取的页数，默认使用 Config.PDF_MAX_PAGES
+            workers: 按页并行提取的进程数，默认由 Config.MAX_WORKERS 和CPU核数决定
+            
+        Returns:
+            Dict[str, Any]: 包含 content、metadata、pages 的字典
+        """
         try:
-            with open(file_path, 'rb') as file:
-                # 创建PDF读取器
-                reader = PyPDF2.PdfReader(file)
-                
-                # 提取文本内容
-                content = ""
-                for page in reader.pages:
-                    content += page.extract_text()
-                
-                # 提取元数据
-                metadata = reader.metadata if reader.metadata else {}
-                
-                return {
-                    "content": content,
-                    "metadata": metadata,
-                    "pages": len(reader.pages)
-                }
+            return extract_pdf(
+                file_path,
+                max_chars=self.config.PDF_MAX_CHARS if max_chars is None else max_chars,
+                max_pages=self.config.PDF_MAX_PAGES if max_pages is None else max_pages,
+                workers=default_pdf_workers(self.config.MAX_WORKERS) if workers is None else workers,
+                parallel_min_pages=self.config.PDF_PARALLEL_MIN_PAGES
+            )
         except Exception as e:
             logger.error(f"解析PDF时出错: {str(e)}")
             raise
             
-    def process_pdf_to_paper(self, file_path: str) -> str:
-        """处理PDF并生成论文"""
-        try:
-            # 解析PDF
-            pdf_data = self.parse_pdf(file_path)
-            
-            # 调用AI生成论文
-            prompt = f"""
+    def _build_pdf_messages(self, content: str) -> List[Dict]:
+        """构建基于PDF内容生成论文的对话消息"""
+        prompt = f"""
             请根据以下参考文献内容生成一篇学术论文：
             
             参考文献内容：
-            {pdf_data['content']}
+            {content}
             
             要求：
             1. 保持学术性和专业性
@@ -448,18 +539,40 @@ class TextProcessor:
             3. 包含合适的引用
             4. 遵循学术论文格式
             """
+        
+        return [
+            {"role": "user", "content": prompt}
+        ]
+        
+    def process_pdf_to_paper(self, file_path: str) -> str:
+        """处理PDF并生成论文"""
+        try:
+            # 解析PDF
+            pdf_data = self.parse_pdf(file_path)
             
-            messages = [
-                {"role": "user", "content": prompt}
-            ]
+            # 调用AI生成论文（内容超出预算时先分段摘要）
+            content = self._condense_text(pdf_data['content'], self._text_token_budget())
+            messages = self._build_pdf_messages(content)
             return self._make_ai_request(messages)
             
         except Exception as e:
             logger.error(f"生成论文时出错: {str(e)}")
             raise
             
-    def batch_process(self, files: List[str]) -> List[Dict[str, Any]]:
-        """批量处理文件"""
+    def batch_process(self, files: List[str], parallel: bool = False) -> List[Dict[str, Any]]:
+        """
+        批量处理文件
+        
+        Args:
+            files: 文件路径列表
+            parallel: 是否使用并行流水线（结果按完成顺序排列）
+            
+        Returns:
+            List[Dict[str, Any]]: 每个文件的处理结果
+        """
+        if parallel:
+            return list(self.iter_batch_process(files))
+            
         results = []
         for file_path in files:
             try:
@@ -468,9 +581,129 @@ class TextProcessor:
                 else:
                     with open(file_path, 'r', encoding='utf-8') as f:
                         text = f.read()
-                    result = self.process_chinese(text, [], {"topic": {"cn": "", "en": ""}, "keywords": {"cn": [], "en": []}})
+                    result = self.process_chinese(text, [], _EMPTY_TOPIC_INFO)
                 results.append({"file": file_path, "result": result})
             except Exception as e:
                 logger.error(f"处理文件 {file_path} 时出错: {str(e)}")
                 results.append({"file": file_path, "error": str(e)})
-        return results 
\ No newline at end of file
+        return results
+        
+    def _generate_for_batch(self, text: str, is_pdf: bool) -> str:
+        """批处理中为单个文件调用AI生成（内容超出预算时先分段摘要）"""
+        if is_pdf:
+            content = self._condense_text(text, self._text_token_budget())
+            return self._make_ai_request(self._build_pdf_messages(content))
+        source_text = self._condense_text(text, self._text_token_budget(self.config.SYSTEM_PROMPT_CN))
+        return self._make_ai_request(self._build_chinese_messages(source_text, [], _EMPTY_TOPIC_INFO))
+        
+    def iter_batch_process(self, files: List[str], max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        并行批量处理文件，按完成顺序逐个产出结果
+        
+        PDF解析和正则格式化在进程池中执行，AI生成在线程池中执行；
+        同时处理的文件不超过 Config.BATCH_SIZE 个，避免一次性占用过多内存，
+        每完成一个文件就提交下一个，个别耗时的文件不会让其余工作线程空等。
+        
+        Args:
+            files: 文件路径列表
+            max_workers: 最大并发数，默认使用 Config.MAX_WORKERS
+            
+        Yields:
+            Dict[str, Any]: 形如 {"file": 路径, "result": 文本} 或 {"file": 路径, "error": 错误信息}
+        """
+        max_workers = max_workers or self.config.MAX_WORKERS
+        cpu_workers = max(1, min(max_workers, os.cpu_count() or 1))
+        total = len(files)
+        done = 0
+        remaining = iter(files)
+        
+        with ProcessPoolExecutor(max_workers=cpu_workers) as cpu_pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as io_pool:
+            # 每个在途文件恰好对应一个未完成的任务
+            pending = {}
+            while True:
+                # 阶段一：读取文件 / 解析PDF，补足在途文件数
+                while len(pending) < self.config.BATCH_SIZE:
+                    file_path = next(remaining, None)
+                    if file_path is None:
+                        break
+                    pending[cpu_pool.submit(_load_document, file_path)] = ('load', file_path, None)
+                if not pending:
+                    break
+                    
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, file_path, text = pending.pop(future)
+                    is_pdf = file_path.lower().endswith('.pdf')
+                    result = None
+                    
+                    try:
+                        if stage == 'load':
+                            # 阶段二：调用AI生成
+                            text = future.result()
+                            pending[io_pool.submit(self._generate_for_batch, text, is_pdf)] = ('generate', file_path, text)
+                            
+                        elif stage == 'generate':
+                            generated_text = future.result()
+                            if is_pdf:
+                                result = {"file": file_path, "result": generated_text}
+                            else:
+                                # 阶段三：格式化并添加参考文献
+                                pending[cpu_pool.submit(_finalize_chinese_worker, generated_text, [])] = ('format', file_path, text)
+                                
+                        else:
+                            result = {"file": file_path, "result": future.result()}
+                            
+                    except Exception as e:
+                        logger.error(f"处理文件 {file_path} 时出错: {str(e)}")
+                        if is_pdf or stage == 'load':
+                            result = {"file": file_path, "error": str(e)}
+                        else:
+                            # 与 process_chinese 一致，生成失败时返回原文
+                            result = {"file": file_path, "result": text}
+                            
+                    if result is not None:
+                        done += 1
+                        logger.info(f"批处理进度: {done}/{total} - {file_path}")
+                        yield result
+
+
+# 提示词模板本身（要求列表、标题等）预留的token数
+_PROMPT_OVERHEAD_TOKENS = 1000
+
+# map-reduce 摘要的最大轮数，仍超出预算时直接截断
+_MAX_REDUCE_ROUNDS = 3
+
+
+def _join_summaries(summaries: List[str]) -> str:
+    """按原文顺序合并各片段摘要"""
+    return "\n\n".join(f"[第{i}部分摘要]\n{summary}" for i, summary in enumerate(summaries, 1))
+
+
+# 批处理文本文件时使用的空主题信息
+_EMPTY_TOPIC_INFO = {"topic": {"cn": "", "en": ""}, "keywords": {"cn": [], "en": []}}
+
+# 工作进程内复用的处理器实例
+_worker_processor: Optional[TextProcessor] = None
+
+
+def _get_worker_processor() -> TextProcessor:
+    """获取当前工作进程的处理器实例"""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = TextProcessor()
+    return _worker_processor
+
+
+def _load_document(file_path: str) -> str:
+    """在工作进程中读取文本文件或解析PDF"""
+    if file_path.lower().endswith('.pdf'):
+        # 已在工作进程中，不再启动嵌套的进程池
+        return _get_worker_processor().parse_pdf(file_path, workers=1)['content']
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _finalize_chinese_worker(generated_text: str, references: List[Paper]) -> str:
+    """在工作进程中格式化中文论文"""
+    return _get_worker_processor()._finalize_chinese(generated_text, references)
@@ -0,0 +1,114 @@
+"""
+提示词预算模块 - 估算token数量，按预算选取条目并切分超长文本
+"""
+
+from typing import List
+
+from segmenter import count_chars
+
+# 中日韩字符及全角标点大约各占一个token，其余文本大约每4个字符一个token
+_CJK_KINDS = ('cjk', 'cjk_punct')
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的token数量
+
+    Args:
+        text: 待估算文本
+
+    Returns:
+        int: 估算的token数
+    """
+    if not text:
+        return 0
+    cjk = count_chars(text, _CJK_KINDS)
+    return cjk + -(-(len(text) - cjk) // _CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    将文本截断到不超过指定的token数
+
+    Args:
+        text: 待截断文本
+        max_tokens: token上限
+
+    Returns:
+        str: 截断后的文本
+    """
+    if max_tokens <= 0:
+        return ""
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    # 按平均字符密度估算截断位置，再逐步收缩直到满足预算
+    end = int(len(text) * max_tokens / tokens)
+    while end > 0 and estimate_tokens(text[:end]) > max_tokens:
+        end = int(end * 0.9)
+    return text[:end]
+
+
+def fit_entries(entries: List[str], max_tokens: int, min_entry_tokens: int = 64) -> List[str]:
+    """
+    按顺序选取条目直到用完预算，最后一条放不下时截断保留
+
+    Args:
+        entries: 按相关性排好序的条目
+        max_tokens: token预算
+        min_entry_tokens: 截断保留一条目所需的最少剩余预算
+
+    Returns:
+        List[str]: 预算内的条目
+    """
+    selected = []
+    remaining = max_tokens
+    for entry in entries:
+        tokens = estimate_tokens(entry)
+        if tokens <= remaining:
+            selected.append(entry)
+            remaining -= tokens
+            continue
+        if remaining >= min_entry_tokens:
+            selected.append(truncate_to_tokens(entry, remaining))
+        break
+    return selected
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    按段落将文本切分为不超过预算的片段
+
+    Args:
+        text: 待切分文本
+        max_tokens: 每个片段的token上限
+
+    Returns:
+        List[str]: 文本片段
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for paragraph in text.split('\n'):
+        tokens = estimate_tokens(paragraph) + 1
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append('\n'.join(current))
+            current, current_tokens = [], 0
+
+        # 单个段落超出预算时按长度硬切分
+        while tokens > max_tokens:
+            head = truncate_to_tokens(paragraph, max_tokens)
+            if not head:
+                break
+            chunks.append(head)
+            paragraph = paragraph[len(head):]
+            tokens = estimate_tokens(paragraph) + 1
+
+        current.append(paragraph)
+        current_tokens += tokens
+
+    if current and any(part.strip() for part in current):
+        chunks.append('\n'.join(current))
+    return chunks
@@ -0,0 +1,72 @@
+"""
+参考文献渲染模块 - 将内存中的文献列表序列化为提示词和文件共用的文本
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from paper import Paper
+
+REFERENCES_HEADER = "# 参考文献列表\n\n"
+
+# 参考文献条目之间的分隔线
+REFERENCE_SEPARATOR = "-" * 80
+
+# 使用压缩后的正文作为键的一部分，缓存命中时不需要解压
+_PaperKey = Tuple[str, str, str, bytes]
+
+
+def _paper_key(paper: Paper) -> _PaperKey:
+    return (paper.title, paper.date or '', paper.source, paper.compressed_content)
+
+
+@lru_cache(maxsize=8)
+def _render_entries(papers: Tuple[_PaperKey, ...]) -> Tuple[str, ...]:
+    entries = []
+    for i, (title, date, source, compressed_content) in enumerate(papers, 1):
+        lines = [f"## 文献 {i}", f"标题: {title}"]
+        if date:
+            lines.append(f"日期: {date}")
+        lines.append(f"来源: {source}")
+        lines.append(f"内容:\n{Paper.decompress_content(compressed_content)}")
+        entries.append("\n".join(lines) + "\n")
+    return tuple(entries)
+
+
+def render_reference_entries(papers: Iterable[Paper]) -> Tuple[str, ...]:
+    """
+    将文献渲染为条目文本，相同的文献列表只渲染一次
+
+    Args:
+        papers: 文献列表
+
+    Returns:
+        Tuple[str, ...]: 每篇文献对应的条目文本
+    """
+    return _render_entries(tuple(_paper_key(paper) for paper in papers))
+
+
+def join_reference_entries(entries: Iterable[str]) -> str:
+    """
+    将条目拼接为完整的参考文献文本（与 references.txt 格式一致）
+
+    Args:
+        entries: 条目文本
+
+    Returns:
+        str: 参考文献文本
+    """
+    return REFERENCES_HEADER + "".join(f"{entry}\n{REFERENCE_SEPARATOR}\n\n" for entry in entries)
+
+
+def render_references(papers: List[Paper]) -> str:
+    """
+    将文献列表渲染为完整的参考文献文本
+
+    Args:
+        papers: 文献列表
+
+    Returns:
+        str: 参考文献文本
+    """
+    return join_reference_entries(render_reference_entries(papers))
@@ -0,0 +1,239 @@
+"""
+响应缓存模块 - 按内容哈希缓存AI生成结果（内存LRU + SQLite持久化）
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(model: str, messages: List[Dict]) -> str:
+    """
+    根据模型和对话消息（含系统提示词）计算缓存键
+
+    Args:
+        model: 模型名称
+        messages: 对话消息列表
+
+    Returns:
+        str: SHA-256 十六进制摘要
+    """
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LRUCache:
+    """线程安全的内存LRU缓存，条目与磁盘缓存使用相同的有效期"""
+
+    def __init__(self, maxsize: int = 100, ttl: int = 0):
+        """
+        初始化内存缓存
+
+        Args:
+            maxsize: 最多保留的条目数
+            ttl: 条目有效期（秒），小于等于0表示永不过期
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and time.time() > expires:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, created: Optional[float] = None):
+        """
+        写入条目
+
+        Args:
+            key: 缓存键
+            value: 内容
+            created: 内容的写入时间，默认为当前时间；从磁盘读回的条目传入其原始写入时间
+        """
+        if self.maxsize <= 0:
+            return
+        expires = (time.time() if created is None else created) + self.ttl if self.ttl > 0 else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DiskCache:
+    """基于SQLite的持久化缓存，支持过期时间和按容量淘汰"""
+
+    def __init__(self, path: str, ttl: int = 7 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        """
+        初始化磁盘缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            ttl: 条目有效期（秒），小于等于0表示永不过期
+            max_bytes: 缓存内容的总字节上限，超出后淘汰最久未访问的条目
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[str, float]]:
+        """返回 (内容, 写入时间)，供调用方按条目年龄判断新鲜度"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl > 0 and now - created > self.ttl:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value, created
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created, accessed, size) VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, size)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        """删除过期条目，并在超出容量时按最久未访问淘汰"""
+        if self.ttl > 0:
+            self._conn.execute("DELETE FROM entries WHERE created < ?", (now - self.ttl,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """两级响应缓存：内存LRU在前，磁盘缓存在后"""
+
+    def __init__(self, maxsize: int = 100, path: Optional[str] = None,
+                 ttl: int = 7 * 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        self.memory = LRUCache(maxsize, ttl=ttl)
+        self.disk = DiskCache(path, ttl=ttl, max_bytes=max_bytes) if path else None
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            try:
+                entry = self.disk.get_entry(key)
+            except sqlite3.Error as e:
+                logger.error(f"读取磁盘缓存失败: {str(e)}")
+                return None
+            if entry is not None:
+                value, created = entry
+                # 沿用磁盘条目的写入时间，内存中的副本与磁盘同时过期
+                self.memory.set(key, value, created)
+        return value
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                logger.error(f"写入磁盘缓存失败: {str(e)}")
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: Config) -> Optional[ResponseCache]:
+    """
+    获取进程内共享的响应缓存
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        Optional[ResponseCache]: 缓存实例，未启用缓存时返回 None
+    """
+    if not config.CACHE_ENABLED:
+        return None
+    path = os.path.join(config.CACHE_DIR, 'responses.sqlite3') if config.CACHE_DIR else ''
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = ResponseCache(
+                maxsize=config.CACHE_SIZE,
+                path=path or None,
+                ttl=config.CACHE_TTL,
+                max_bytes=config.CACHE_MAX_BYTES
+            )
+            _caches[path] = cache
+        return cache
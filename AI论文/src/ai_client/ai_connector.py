@@ -6,8 +6,12 @@ import asyncio
 import aiohttp
 import json
 import logging
-from typing import Dict, Any, AsyncGenerator
+import random
+from typing import Dict, Any, AsyncGenerator, Iterable, List, Optional
 from config import Config
+from sse import StreamStatus, aiter_sse_content
+from http_pool import API_BASE_URL, CHAT_ENDPOINT, KEEPALIVE_TIMEOUT
+from response_cache import get_response_cache, make_cache_key
 
 class AIConnector:
     """AI服务连接器"""
@@ -20,7 +24,7 @@ class AIConnector:
             config: 配置对象
         """
         self.config = config
-        self.base_url = "https://gpt-5.vip"
+        self.base_url = API_BASE_URL
         self.headers = {
             'Authorization': config.AI_API_KEY,
             'User-Agent': 'AI-Text-Processor/1.0',
@@ -28,13 +32,27 @@ class AIConnector:
             'Accept': '*/*',
         }
         self.session = None
+        self.cache = get_response_cache(config)
         self.logger = logging.getLogger(__name__)
 
     async def __aenter__(self):
         """异步上下文管理器入口"""
+        # 与同步连接池采用相同的并发上限和保活策略
+        connector = aiohttp.TCPConnector(
+            limit=self.config.MAX_WORKERS,
+            keepalive_timeout=KEEPALIVE_TIMEOUT
+        )
+        # 不限制整个请求的总时长，长回答可以持续生成；只限制建立连接和两段数据之间的等待
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            sock_connect=self.config.TIMEOUT,
+            sock_read=self.config.READ_TIMEOUT or None
+        )
         self.session = aiohttp.ClientSession(
             base_url=self.base_url,
-            headers=self.headers
+            headers=self.headers,
+            connector=connector,
+            timeout=timeout
         )
         return self
 
@@ -43,24 +61,35 @@ class AIConnector:
         if self.session:
             await self.session.close()
 
-    async def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    async def _make_request(self, endpoint: str, payload: Dict[str, Any],
+                            read_timeout: Optional[float] = None) -> AsyncGenerator[str, None]:
         """
         发送请求到AI服务
         
         Args:
             endpoint: API端点
             payload: 请求数据
+            read_timeout: 等待下一段数据的超时时间（秒），默认使用会话的 Config.READ_TIMEOUT
             
         Yields:
             AI响应的数据流
         """
+        options = {}
+        if read_timeout is not None:
+            options['timeout'] = aiohttp.ClientTimeout(
+                total=None, sock_connect=self.config.TIMEOUT, sock_read=read_timeout
+            )
         retries = self.config.MAX_RETRIES
+        attempt = 0
         while retries > 0:
+            received = False
             try:
-                async with self.session.post(endpoint, json=payload) as response:
+                async with self.session.post(endpoint, json=payload, **options) as response:
                     if response.status == 200:
-                        async for line in response.content.iter_any():
+                        # 按行读取，保证每个SSE事件完整
+                        async for line in response.content:
                             if line:
+                                received = True
                                 yield line.decode('utf-8')
                     else:
                         error_msg = await response.text()
@@ -69,10 +98,26 @@ class AIConnector:
                 break
             except Exception as e:
                 retries -= 1
-                if retries == 0:
+                # 已经产出部分数据时不能重试，否则调用方会收到重复内容
+                if retries == 0 or received:
                     raise
-                self.logger.warning(f"请求失败，剩余重试次数: {retries}, 错误: {str(e)}")
-                await asyncio.sleep(self.config.RETRY_DELAY)
+                delay = self._backoff_delay(attempt)
+                attempt += 1
+                self.logger.warning(f"请求失败，剩余重试次数: {retries}, {delay:.2f}秒后重试, 错误: {str(e)}")
+                await asyncio.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        计算重试前的等待时间（指数退避 + 全抖动）
+        
+        Args:
+            attempt: 已重试次数，从0开始
+            
+        Returns:
+            float: 等待秒数，在 [0, min(TIMEOUT, RETRY_DELAY * 2^attempt)] 内均匀分布
+        """
+        ceiling = min(self.config.TIMEOUT, self.config.RETRY_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
 
     async def process_text(self, text: str) -> AsyncGenerator[str, None]:
         """
@@ -84,39 +129,116 @@ class AIConnector:
         Yields:
             处理后的文本流
         """
-        payload = {
-            "model": self.config.AI_MODEL,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": text
-                }
-            ],
-            "stream": True
-        }
+        messages = [
+            {
+                "role": "user",
+                "content": text
+            }
+        ]
         
         try:
-            async for response in self._make_request("/v1/chat/completions", payload):
-                yield response
+            async for content in self.stream_chat(messages):
+                yield content
         except Exception as e:
             self.logger.error(f"处理文本时出错: {str(e)}")
             raise
 
-    async def batch_process(self, texts: list[str]) -> AsyncGenerator[str, None]:
+    async def stream_chat(self, messages: List[Dict],
+                          read_timeout: Optional[float] = None) -> AsyncGenerator[str, None]:
         """
-        批量处理文本
+        发送对话请求并解析流式响应，命中缓存时一次性返回缓存内容
         
         Args:
-            texts: 文本列表
+            messages: 对话消息列表
+            read_timeout: 等待下一段数据的超时时间（秒），默认使用 Config.READ_TIMEOUT
             
         Yields:
-            处理后的文本流
+            模型生成的文本片段
+        """
+        cache_key = make_cache_key(self.config.AI_MODEL, messages) if self.cache else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("命中响应缓存")
+                yield cached
+                return
+                
+        payload = {
+            "model": self.config.AI_MODEL,
+            "messages": messages,
+            "stream": True
+        }
+        
+        parts = []
+        status = StreamStatus()
+        async for content in aiter_sse_content(self._make_request(CHAT_ENDPOINT, payload, read_timeout), status):
+            parts.append(content)
+            yield content
+            
+        # 被截断的响应（连接提前关闭、超出长度）不写入缓存，避免之后一直返回残缺的结果
+        if cache_key and parts and status.complete:
+            self.cache.set(cache_key, "".join(parts))
+        elif not status.complete:
+            self.logger.warning(f"响应未完整结束（finish_reason={status.finish_reason}），不写入缓存")
+
+    async def chat(self, messages: List[Dict], read_timeout: Optional[float] = None) -> str:
         """
-        tasks = [self.process_text(text) for text in texts]
-        async for result in asyncio.as_completed(tasks):
+        发送对话请求并返回完整的生成文本
+        
+        Args:
+            messages: 对话消息列表
+            read_timeout: 等待下一段数据的超时时间（秒），默认使用 Config.READ_TIMEOUT
+            
+        Returns:
+            模型生成的完整文本
+        """
+        parts = []
+        async for content in self.stream_chat(messages, read_timeout):
+            parts.append(content)
+        return "".join(parts)
+
+    async def batch_process(self, texts: Iterable[str], timeout: Optional[float] = None) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        批量处理文本，同时进行的请求数受 Config.MAX_WORKERS 限制
+        
+        输入按需读取，在途任务不超过 MAX_WORKERS 个，每完成一个再提交下一个。
+        
+        Args:
+            texts: 文本序列，可以是生成器
+            timeout: 等待下一段数据的超时时间（秒），默认使用 Config.READ_TIMEOUT；
+                不限制整个回答的生成时长
+            
+        Yields:
+            按完成顺序返回的结果，形如 {"index": 输入下标, "result": 文本} 或 {"index": 输入下标, "error": 错误信息}
+        """
+        async def run(index: int, text: str) -> Dict[str, Any]:
             try:
-                async for response in result:
-                    yield response
+                messages = [{"role": "user", "content": text}]
+                result = await self.chat(messages, read_timeout=timeout)
+                return {"index": index, "result": result}
+            except asyncio.TimeoutError:
+                self.logger.error(f"批量处理第 {index} 条文本超时")
+                return {"index": index, "error": "读取响应超时"}
             except Exception as e:
-                self.logger.error(f"批量处理时出错: {str(e)}")
-                continue 
\ No newline at end of file
+                self.logger.error(f"批量处理第 {index} 条文本时出错: {str(e)}")
+                return {"index": index, "error": str(e)}
+                
+        items = enumerate(texts)
+        pending = set()
+        try:
+            while True:
+                # 保持有限数量的任务在途，边读取输入边提交
+                while len(pending) < self.config.MAX_WORKERS:
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    pending.add(asyncio.ensure_future(run(*item)))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            # 调用方提前停止迭代时取消尚未完成的请求
+            for task in pending:
+                task.cancel()
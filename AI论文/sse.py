@@ -0,0 +1,115 @@
+"""
+流式响应解析模块 - 逐行解析 /v1/chat/completions 返回的SSE数据
+"""
+
+import json
+from typing import AsyncIterable, AsyncGenerator, Iterable, Iterator, NamedTuple, Optional, Union
+
+Line = Union[bytes, str]
+
+
+class SSEEvent(NamedTuple):
+    """单行SSE数据的解析结果"""
+    done: bool = False                   # 是否为 [DONE] 结束标记
+    content: Optional[str] = None        # 内容片段
+    finish_reason: Optional[str] = None  # 本行携带的结束原因
+
+
+class StreamStatus:
+    """记录流式响应是否完整结束，只有完整的响应才应写入缓存"""
+
+    def __init__(self):
+        self.done = False
+        self.finish_reason: Optional[str] = None
+
+    def update(self, event: SSEEvent):
+        if event.done:
+            self.done = True
+        if event.finish_reason:
+            self.finish_reason = event.finish_reason
+
+    @property
+    def complete(self) -> bool:
+        """收到 [DONE] 或 finish_reason 为 stop，且没有因长度等原因被截断"""
+        return (self.done or self.finish_reason == 'stop') and self.finish_reason in (None, 'stop')
+
+
+def parse_sse_line(line: Line) -> SSEEvent:
+    """
+    解析单行SSE数据
+
+    Args:
+        line: 原始数据行
+
+    Returns:
+        SSEEvent: (是否已结束, 内容片段, 结束原因)
+    """
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    line = line.strip()
+    if not line.startswith('data: '):
+        return SSEEvent()
+
+    json_str = line[6:]  # 移除 'data: ' 前缀
+    if json_str.strip() == '[DONE]':
+        return SSEEvent(done=True)
+
+    try:
+        response_data = json.loads(json_str)
+    except json.JSONDecodeError:
+        return SSEEvent()
+
+    if 'choices' in response_data and len(response_data['choices']) > 0:
+        choice = response_data['choices'][0]
+        delta = choice.get('delta') or {}
+        return SSEEvent(content=delta.get('content') or None, finish_reason=choice.get('finish_reason'))
+    return SSEEvent()
+
+
+def iter_sse_content(lines: Iterable[Line], status: Optional[StreamStatus] = None) -> Iterator[str]:
+    """
+    从按行到达的数据中逐个产出内容片段
+
+    Args:
+        lines: 数据行迭代器（如 http.client.HTTPResponse）
+        status: 可选，记录是否收到结束标记和结束原因
+
+    Yields:
+        模型生成的文本片段
+    """
+    for line in lines:
+        event = parse_sse_line(line)
+        if status is not None:
+            status.update(event)
+        if event.done:
+            break
+        if event.content:
+            yield event.content
+
+
+async def aiter_sse_content(lines: AsyncIterable[Line],
+                            status: Optional[StreamStatus] = None) -> AsyncGenerator[str, None]:
+    """
+    iter_sse_content 的异步版本
+
+    Args:
+        lines: 异步数据行迭代器（如 aiohttp 的 response.content）
+        status: 可选，记录是否收到结束标记和结束原因
+
+    Yields:
+        模型生成的文本片段
+    """
+    try:
+        async for line in lines:
+            event = parse_sse_line(line)
+            if status is not None:
+                status.update(event)
+            if event.done:
+                break
+            if event.content:
+                yield event.content
+    finally:
+        # 提前结束时关闭上游异步生成器，及时释放连接
+        aclose = getattr(lines, 'aclose', None)
+        if aclose is not None:
+            await aclose()
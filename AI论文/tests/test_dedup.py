@@ -0,0 +1,55 @@
+"""
+近似重复检测测试
+"""
+
+from dedup import NearDuplicateIndex, load_index
+from paper import Paper
+
+
+def test_deduplicate_merges_title_variants():
+    papers = [
+        Paper(title="Deep Learning for Medical Image Analysis", source="Nature Medicine"),
+        Paper(title="Deep learning for medical image analysis.", source="Nature Medicine"),
+        Paper(title="DEEP LEARNING FOR MEDICAL IMAGE ANALYSIS", source="Nature Medicine"),
+        Paper(title="Graph Neural Networks in Drug Discovery", source="Science"),
+    ]
+    unique = NearDuplicateIndex().deduplicate(papers)
+    assert unique == [papers[0], papers[3]]
+
+
+DISTINCT_TITLES = [
+    "Attention Is All You Need",
+    "Federated Learning for Hospital Records",
+    "Protein Structure Prediction with AlphaFold",
+    "Explainable Models in Clinical Decision Support",
+    "Privacy Risks of Large Language Models",
+    "基于知识图谱的药物重定位",
+    "医学影像分割的半监督方法",
+]
+
+
+def test_deduplicate_keeps_distinct_papers():
+    papers = [Paper(title=title) for title in DISTINCT_TITLES]
+    assert NearDuplicateIndex().deduplicate(papers) == papers
+
+
+def test_saved_index_recognises_earlier_papers(tmp_path):
+    path = str(tmp_path / "dedup_index.npz")
+    index = load_index(path)
+    index.deduplicate([Paper(title="基于深度学习的医学影像诊断研究")])
+    index.save(path)
+
+    reloaded = load_index(path)
+    first = reloaded.canonical_id(Paper(title="基于深度学习的医学影像诊断研究。"))
+    assert len(reloaded) == 1
+    assert first == index.canonical_id(Paper(title="基于深度学习的医学影像诊断研究"))
+
+
+def test_save_keeps_only_newest_entries(tmp_path):
+    path = str(tmp_path / "dedup_index.npz")
+    index = load_index(path, max_entries=3)
+    index.deduplicate([Paper(title=title) for title in DISTINCT_TITLES[:6]])
+    index.save(path)
+    reloaded = load_index(path, max_entries=3)
+    assert len(reloaded) == 3
+    assert reloaded._ids == index._ids[-3:]
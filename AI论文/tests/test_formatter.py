@@ -0,0 +1,38 @@
+"""
+论文格式化测试：AI特征删除与逐条 re.sub 的原实现一致
+"""
+
+import re
+
+from config import Config
+from formatter import _EN_AI_PATTERNS, _remove_each, get_format_rules
+
+
+def _baseline_remove_ai(text, config):
+    patterns = list(_EN_AI_PATTERNS) + [rf'(?:{p}).*?\.' for p in config.PATTERNS]
+    for pattern in patterns:
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    return text
+
+
+def test_ai_features_match_per_pattern_sub():
+    config = Config()
+    rules = get_format_rules(config)
+    samples = [
+        "Results improved. I apologize, this is wrong. As an AI model, we proceed.",
+        "PLEASE NOTE THAT the data is noisy. In my opinion it works. Done.",
+        "I suggest I cannot do this. then I am not able to stop. End.",
+        "Based on my understanding, based on my understanding twice. Tail",
+        "İ cannot fold. Kelvin I do not have data. ok.",
+    ]
+    for text in samples:
+        assert _remove_each(text, rules.en_ai_res) == _baseline_remove_ai(text, config)
+
+
+def test_config_patterns_follow_builtin_patterns():
+    config = Config()
+    config.PATTERNS = ['As an AI']
+    rules = get_format_rules(config)
+    assert len(rules.en_ai_res) == len(_EN_AI_PATTERNS) + 1
+    text = "As an AI language model, I think so. Next."
+    assert _remove_each(text, rules.en_ai_res) == _baseline_remove_ai(text, config)
@@ -0,0 +1,43 @@
+"""
+RAKE 关键短语测试
+"""
+
+from keyphrase import RakeExtractor
+
+
+def test_candidates_split_on_stopwords_and_punctuation():
+    rake = RakeExtractor()
+    assert rake.candidates("Deep learning improves the accuracy of tumor detection, however.") == [
+        ("deep", "learning"), ("accuracy",), ("tumor", "detection")
+    ]
+
+
+def test_rank_orders_by_score_and_frequency():
+    rake = RakeExtractor()
+    text = ("Graph neural networks are popular. Many use graph neural networks for toxicity. "
+            "Toxicity data is scarce.")
+    ranked = rake.extract(text, top_k=3)
+    assert ranked[0][0] == "graph neural networks"
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+def test_rank_empty_candidates():
+    assert RakeExtractor().rank([]) == []
+
+
+def test_rank_falls_back_to_windows_of_long_candidates():
+    rake = RakeExtractor()
+    ranked = rake.extract("Deep learning medical imaging models", top_k=3)
+    assert ranked
+    assert all(len(phrase.split()) == rake.max_words for phrase, _ in ranked)
+    assert ranked[0][0] in "deep learning medical imaging models"
+
+
+def test_rake_topic_for_title_without_stopwords():
+    from analyzer import TopicAnalyzer
+
+    result = TopicAnalyzer(idf_index_path='', keyphrase_backend='rake').analyze(
+        "Deep learning medical imaging models"
+    )
+    assert result['topic']['en']
+    assert result['keywords']['en']
@@ -0,0 +1,46 @@
+"""
+提示词预算测试
+"""
+
+from prompt_budget import chunk_text, estimate_tokens, fit_entries, truncate_to_tokens
+
+
+def test_estimate_tokens_counts_cjk_per_char():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("中文") == 2
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("中文abcd") == 3
+
+
+def test_truncate_to_tokens_respects_budget():
+    text = "深度学习" * 100
+    assert estimate_tokens(truncate_to_tokens(text, 50)) <= 50
+    assert truncate_to_tokens(text, 0) == ""
+    assert truncate_to_tokens("short", 100) == "short"
+
+
+def test_fit_entries_keeps_order_and_truncates_last():
+    entries = ["a" * 40, "b" * 40, "c" * 400]
+    selected = fit_entries(entries, 30, min_entry_tokens=5)
+    assert selected[:2] == entries[:2]
+    assert selected[2].startswith("c")
+    assert sum(estimate_tokens(entry) for entry in selected) <= 30
+
+
+def test_fit_entries_drops_last_entry_below_minimum():
+    assert fit_entries(["a" * 40, "b" * 400], 12, min_entry_tokens=5) == ["a" * 40]
+
+
+def test_chunk_text_splits_on_paragraphs_within_budget():
+    paragraphs = [f"第{i}段" + "内容" * 20 for i in range(10)]
+    chunks = chunk_text("\n".join(paragraphs), 100)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert "\n".join(chunks) == "\n".join(paragraphs)
+
+
+def test_chunk_text_hard_splits_long_paragraph():
+    text = "长" * 500
+    chunks = chunk_text(text, 100)
+    assert "".join(chunks) == text
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
@@ -0,0 +1,33 @@
+"""
+BM25 相关性打分测试
+"""
+
+import numpy as np
+
+from ranking import bm25_scores, tokenize
+
+
+def test_tokenize_mixes_cjk_bigrams_and_words():
+    assert tokenize("深度学习 for Medical imaging") == ["深度", "度学", "学习", "medical", "imaging"]
+
+
+def test_bm25_scores_prefers_matching_documents():
+    documents = [tokenize(text) for text in (
+        "deep learning for medical imaging",
+        "medical imaging survey",
+        "graph databases",
+    )]
+    scores = bm25_scores(documents, tokenize("deep learning medical imaging"))
+    assert scores.argmax() == 0
+    assert scores[2] == 0
+    assert scores[0] > scores[1] > 0
+
+
+def test_bm25_scores_empty_inputs():
+    assert bm25_scores([], ["x"]).shape == (0,)
+    assert np.array_equal(bm25_scores([["a"], ["b"]], []), np.zeros(2))
+
+
+def test_bm25_scores_ignore_repeated_query_terms():
+    documents = [["a", "b"], ["b", "c"]]
+    assert np.allclose(bm25_scores(documents, ["a", "a"]), bm25_scores(documents, ["a"]))
@@ -0,0 +1,97 @@
+"""
+响应缓存测试：过期时间和写入条件
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from response_cache import LRUCache, ResponseCache
+from sse import StreamStatus
+
+MESSAGES = [{"role": "user", "content": "写一篇论文"}]
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+
+def test_lru_cache_expires_entries():
+    cache = LRUCache(maxsize=10, ttl=5)
+    cache.set("old", "v", created=time.time() - 10)
+    cache.set("new", "v")
+    assert cache.get("old") is None
+    assert cache.get("new") == "v"
+
+
+def test_memory_copy_keeps_disk_write_time(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    writer = ResponseCache(maxsize=10, path=path, ttl=5)
+    writer.set("k", "v")
+    writer.disk._conn.execute("UPDATE entries SET created = ?", (time.time() - 4,))
+    writer.disk._conn.commit()
+
+    reader = ResponseCache(maxsize=10, path=path, ttl=5)
+    assert reader.get("k") == "v"
+    # 内存中的副本沿用磁盘条目的写入时间，而不是读回的时间
+    _, expires = reader.memory._data["k"]
+    assert expires < time.time() + 2
+
+
+def fake_stream(parts, finish_reason):
+    def stream(messages, status=None):
+        for part in parts:
+            yield part
+        if status is not None and finish_reason is not None:
+            status.finish_reason = finish_reason
+            status.done = True
+    return stream
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    from processor import TextProcessor
+
+    monkeypatch.chdir(tmp_path)
+    instance = TextProcessor()
+    instance.cache = ResponseCache(maxsize=10)
+    return instance
+
+
+@pytest.mark.parametrize("finish_reason, cached", [("stop", True), ("length", False), (None, False)])
+def test_make_ai_request_caches_only_complete_responses(processor, monkeypatch, finish_reason, cached):
+    from response_cache import make_cache_key
+
+    monkeypatch.setattr(processor, "stream_ai_request", fake_stream(["一", "二"], finish_reason))
+    assert processor._make_ai_request(MESSAGES) == "一二"
+    key = make_cache_key(processor.config.AI_MODEL, MESSAGES)
+    assert (processor.cache.get(key) == "一二") is cached
+
+
+@pytest.mark.parametrize("lines, cached", [
+    (['data: {"choices": [{"delta": {"content": "x"}}]}', "data: [DONE]"], True),
+    (['data: {"choices": [{"delta": {"content": "x"}}]}'], False),
+])
+def test_stream_chat_caches_only_complete_responses(lines, cached):
+    from config import Config
+    from response_cache import make_cache_key
+    from src.ai_client.ai_connector import AIConnector
+
+    connector = AIConnector(Config())
+    connector.cache = ResponseCache(maxsize=10)
+
+    async def make_request(endpoint, payload, read_timeout=None):
+        for line in lines:
+            yield line
+
+    connector._make_request = make_request
+    assert asyncio.run(connector.chat(MESSAGES)) == "x"
+    key = make_cache_key(connector.config.AI_MODEL, MESSAGES)
+    assert (connector.cache.get(key) == "x") is cached
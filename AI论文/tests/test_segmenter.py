@@ -0,0 +1,32 @@
+"""
+文本切分测试
+"""
+
+from segmenter import Span, count_chars, iter_spans
+
+
+def urls(text):
+    return [span.text for span in iter_spans(text, ('url',))]
+
+
+def test_url_stops_before_trailing_punctuation():
+    assert urls("See (https://example.org/a?b=1).") == ["https://example.org/a?b=1"]
+    assert urls("Links: https://a.org/x, https://b.org/y; done") == ["https://a.org/x", "https://b.org/y"]
+    assert urls('"https://a.org/path/"!') == ["https://a.org/path/"]
+    assert urls("见https://a.org/论文。") == ["https://a.org/"]
+
+
+def test_url_keeps_inner_punctuation():
+    assert urls("https://a.org/x.html?q=1&r=(2)#top") == ["https://a.org/x.html?q=1&r=(2)#top"]
+
+
+def test_iter_spans_kinds_and_positions():
+    spans = list(iter_spans("深度学习 uses GPU 2024年，见 http://x.cn/a."))
+    assert spans[0] == Span('cjk', 0, 4, '深度学习')
+    assert [span.kind for span in spans] == ['cjk', 'latin', 'latin', 'digit', 'cjk', 'cjk_punct', 'cjk', 'url']
+    assert spans[-1].text == "http://x.cn/a"
+    assert all(isinstance(span, Span) for span in spans)
+
+
+def test_count_chars():
+    assert count_chars("深度学习，abc", ('cjk', 'cjk_punct')) == 5
@@ -0,0 +1,66 @@
+"""
+流式响应解析测试
+"""
+
+import asyncio
+import json
+
+from sse import StreamStatus, aiter_sse_content, iter_sse_content, parse_sse_line
+
+
+def event(content=None, finish_reason=None) -> str:
+    delta = {"content": content} if content is not None else {}
+    return "data: " + json.dumps({"choices": [{"delta": delta, "finish_reason": finish_reason}]})
+
+
+def test_parse_sse_line_ignores_non_data_and_bad_json():
+    assert parse_sse_line(": keep-alive").content is None
+    assert parse_sse_line("data: {not json").content is None
+    assert parse_sse_line(b"data: [DONE]\n").done
+
+
+def test_iter_sse_content_stops_at_done():
+    status = StreamStatus()
+    lines = [event("你好"), b"\n", event("world").encode("utf-8"), "data: [DONE]", event("after")]
+    assert list(iter_sse_content(lines, status)) == ["你好", "world"]
+    assert status.complete
+
+
+def test_stream_without_done_is_incomplete():
+    status = StreamStatus()
+    assert list(iter_sse_content([event("a"), event("b")], status)) == ["a", "b"]
+    assert not status.complete
+
+
+def test_finish_reason_stop_is_complete_without_done():
+    status = StreamStatus()
+    list(iter_sse_content([event("a"), event(finish_reason="stop")], status))
+    assert status.complete
+
+
+def test_finish_reason_length_is_incomplete_even_with_done():
+    status = StreamStatus()
+    list(iter_sse_content([event("a"), event(finish_reason="length"), "data: [DONE]"], status))
+    assert status.done
+    assert not status.complete
+
+
+def test_aiter_sse_content_closes_upstream():
+    closed = []
+
+    async def lines():
+        try:
+            for line in (event("a"), event("b"), "data: [DONE]", event("c")):
+                yield line
+        finally:
+            closed.append(True)
+
+    async def collect():
+        status = StreamStatus()
+        parts = [part async for part in aiter_sse_content(lines(), status)]
+        return parts, status
+
+    parts, status = asyncio.run(collect())
+    assert parts == ["a", "b"]
+    assert status.complete
+    assert closed == [True]